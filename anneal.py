@@ -0,0 +1,223 @@
+# script anneal.py
+"""Searches for the highest scoring boards a cube set can produce, using
+simulated annealing over a process pool.
+
+Each chain starts from a shaken board and makes one move per step: either
+swap the cubes on two cells (or a cell and an unused cube) or turn one
+cube to another face, so every board visited is one the cube set could
+really produce.  Moves that raise the score are kept; moves that lower it
+by d points are kept with probability exp(-d / T), where the temperature
+T cools geometrically over the chain.
+
+    python anneal.py --chains 8 --steps 20000 --output monsters.json
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from multiprocessing import Pool, cpu_count
+from bogglegrid import BoggleGrid, cubesFor
+from bogglesolver import SolverEngine
+from lexiconcache import attachLexicon, loadLexicon, shareLexicon
+from myrandom import BoggleRandom
+from scoring import rulesFor
+
+_engine = None  # per worker SolverEngine, set by _initWorker
+
+
+class AnnealResult:
+    """The best board found by one annealing chain, with attributes:
+       *  tiles is the row major list of tile strings
+       *  cubes, faces are the row major cube and face indices producing them
+       *  score (int) is the board's maximum score
+       *  seed (int) is the seed the chain ran from
+       *  trajectory is a list of (step, current score, best score) samples
+    """
+
+    __slots__ = ['tiles', 'cubes', 'faces', 'score', 'seed', 'trajectory']
+
+    def __init__(self, tiles, cubes, faces, score, seed, trajectory):
+        self.tiles = tiles
+        self.cubes = cubes
+        self.faces = faces
+        self.score = score
+        self.seed = seed
+        self.trajectory = trajectory
+
+    def grid(self, rows, cols):
+        """Returns a BoggleGrid holding the board"""
+        grid = BoggleGrid(rows, cols)
+        grid.placeCubes(self.cubes, self.faces)
+        return grid
+
+    def __repr__(self):
+        return "AnnealResult({}, score={}, seed={})".format(
+            ''.join(self.tiles), self.score, self.seed)
+
+
+def anneal(engine, steps, rng, rules=None, cubes=None, startTemp=20.0,
+           endTemp=0.5, every=100):
+    """Runs one annealing chain of steps moves with the SolverEngine engine,
+    drawing from the BoggleRandom rng, and returns the AnnealResult of the
+    best board visited.  Boards are scored with rules and built from cubes
+    (by default the rules and cube set for the engine's board size).
+    >>> from bogglelexicon import BoggleLexicon
+    >>> lex = BoggleLexicon.fromWords(["tea", "eat", "ate", "tee", "seat", "teas"])
+    >>> result = anneal(SolverEngine(4, 4, lex), 300, BoggleRandom(3))
+    >>> result.score > 0, result.trajectory[-1][2] == result.score
+    (True, True)
+    >>> result.grid(4, 4).tiles == result.tiles
+    True
+    """
+    rows, cols = engine.rows, engine.cols
+    if rules is None:
+        rules = rulesFor(rows, cols)
+    if cubes is None:
+        cubes = cubesFor(rows, cols)
+    size = rows * cols
+    sides = len(cubes[0])
+
+    # order is every cube, the first size of them on the board; faces is
+    # the face each cube shows, by cube
+    grid = BoggleGrid(rows, cols)
+    grid.shakeCubes(cubes, rng)
+    order = grid.cubes + [cube for cube in range(len(cubes)) if cube not in grid.cubes]
+    faces = [rng.randint(0, sides - 1) for cube in cubes]
+    for cell in range(size):
+        faces[order[cell]] = grid.faces[cell]
+    tiles = list(grid.tiles)
+
+    def score():
+        return rules.scoreWords(engine.findWords(tiles))
+
+    current = best = score()
+    bestState = (list(tiles), order[:size], [faces[cube] for cube in order[:size]])
+    trajectory = [(0, current, best)]
+    cooling = (endTemp / startTemp) ** (1.0 / max(steps - 1, 1))
+    temp = startTemp
+
+    for step in range(1, steps + 1):
+        if rng.randint(0, 1):
+            # swap the cube on a cell with any other cube
+            i = rng.randint(0, size - 1)
+            j = rng.randint(0, len(order) - 2)
+            j += j >= i
+            order[i], order[j] = order[j], order[i]
+            changed = (i, j) if j < size else (i,)
+            undo = (i, j, None)
+        else:
+            # turn the cube on a cell to another face
+            i = rng.randint(0, size - 1)
+            cube = order[i]
+            old = faces[cube]
+            new = rng.randint(0, sides - 2)
+            faces[cube] = new + (new >= old)
+            changed = (i,)
+            undo = (i, None, old)
+
+        saved = [tiles[cell] for cell in changed]
+        for cell in changed:
+            tiles[cell] = cubes[order[cell]][faces[order[cell]]]
+        candidate = score()
+        delta = candidate - current
+        if delta >= 0 or rng.random() < math.exp(delta / temp):
+            current = candidate
+            if current > best:
+                best = current
+                bestState = (list(tiles), order[:size],
+                             [faces[cube] for cube in order[:size]])
+        else:
+            i, j, old = undo
+            if j is None:
+                faces[order[i]] = old
+            else:
+                order[i], order[j] = order[j], order[i]
+            for cell, tile in zip(changed, saved):
+                tiles[cell] = tile
+        temp *= cooling
+        if step % every == 0 or step == steps:
+            trajectory.append((step, current, best))
+
+    bestTiles, bestCubes, bestFaces = bestState
+    return AnnealResult(bestTiles, bestCubes, bestFaces, best, rng.seed, trajectory)
+
+
+def _initWorker(name, rows, cols):
+    """Pool initializer: attaches to the shared lexicon block name"""
+    global _engine
+    _engine = SolverEngine(rows, cols, attachLexicon(name))
+
+
+def runChain(unit):
+    """Given a work unit (seed, steps, startTemp, endTemp, every), runs one
+    chain with the worker's engine and returns its AnnealResult"""
+    seed, steps, startTemp, endTemp, every = unit
+    return anneal(_engine, steps, BoggleRandom(seed), startTemp=startTemp,
+                  endTemp=endTemp, every=every)
+
+
+def run(chains, steps, workers=None, rows=4, cols=4, seed=None,
+        source='bogwords.txt', startTemp=20.0, endTemp=0.5, every=100):
+    """Runs chains annealing chains of steps moves each over workers
+    processes (default: one per core) and returns their AnnealResults,
+    best first.  The same seed always gives the same results."""
+    rng = BoggleRandom(seed)
+    units = [(rng.spawn(chain).seed, steps, startTemp, endTemp, every)
+             for chain in range(chains)]
+    # boards only come from the cube set, so the words it cannot spell can go
+    block = shareLexicon(loadLexicon(source, cubes=cubesFor(rows, cols)))
+    try:
+        with Pool(workers or cpu_count(), _initWorker, (block.name, rows, cols)) as pool:
+            results = pool.map(runChain, units, chunksize=1)
+    finally:
+        block.close()
+        block.unlink()
+    results.sort(key=lambda result: -result.score)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--chains', type=int, default=8, help='number of chains')
+    parser.add_argument('--steps', type=int, default=10000, help='moves per chain')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes (default: one per core)')
+    parser.add_argument('--size', type=int, default=4, choices=[4, 5, 6],
+                        help='board size: 4 (classic), 5 (Big) or 6 (Super Big)')
+    parser.add_argument('--start-temp', type=float, default=20.0, help='starting temperature')
+    parser.add_argument('--end-temp', type=float, default=0.5, help='final temperature')
+    parser.add_argument('--every', type=int, default=100,
+                        help='steps between trajectory samples')
+    parser.add_argument('--top', type=int, default=3, help='boards to print')
+    parser.add_argument('--lexicon', default='bogwords.txt', help='word list')
+    parser.add_argument('--seed', type=int, default=None, help='seed for a reproducible run')
+    parser.add_argument('--output', default=None,
+                        help='JSON file for every chain\'s best board and trajectory')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = run(args.chains, args.steps, args.workers, args.size, args.size,
+                  args.seed, args.lexicon, args.start_temp, args.end_temp, args.every)
+    elapsed = time.perf_counter() - start
+
+    for result in results[:args.top]:
+        print('score {} (seed {})'.format(result.score, result.seed))
+        print(result.grid(args.size, args.size))
+        print(' -> '.join(str(best) for step, current, best in
+                          result.trajectory[::max(len(result.trajectory) // 8, 1)]))
+        print()
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump([{'tiles': result.tiles, 'cubes': result.cubes,
+                        'faces': result.faces, 'score': result.score,
+                        'seed': result.seed, 'trajectory': result.trajectory}
+                       for result in results], f, indent=1)
+    moves = args.chains * args.steps
+    print('{} chains x {} steps in {:.1f} s ({:.0f} moves/s)'.format(
+        args.chains, args.steps, elapsed, moves / elapsed), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
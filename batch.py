@@ -0,0 +1,159 @@
+# script batch.py
+"""Generates and solves boards in bulk over a process pool, streaming one
+line per board to an output file as chunks finish.
+
+Each output line is tab separated: the row major tiles joined together
+(e.g. "QuEPPHFOY..."), the number of scoring words on the board and the
+board's maximum score.
+
+    python batch.py 1000000 --output pool.tsv --workers 8
+"""
+
+import argparse
+import sys
+import time
+from itertools import islice
+from multiprocessing import Pool, cpu_count
+from boardfilter import BoardFilter, goodBoards
+from bogglegrid import BoggleGrid, cubesFor
+from bogglesolver import SolverEngine
+from lexiconcache import attachLexicon, loadLexicon, shareLexicon
+from myrandom import BoggleRandom
+from scoring import rulesFor
+
+_engine = None  # per worker SolverEngine, set by _initWorker
+_filter = None  # per worker BoardFilter, set by _initWorker
+
+
+def _initWorker(name, rows, cols, boardFilter=None):
+    """Pool initializer: attaches to the lexicon in the shared memory block
+    name, so every worker reads the same copy"""
+    global _engine, _filter
+    _engine = SolverEngine(rows, cols, attachLexicon(name))
+    _filter = boardFilter
+
+
+def solveChunk(unit):
+    """Given a work unit (count, seed, maxTries), shakes count boards from
+    a BoggleRandom seeded with seed, solves them with the worker's engine
+    and returns the output lines for them as one string.  With a
+    BoardFilter, boards are drawn until count of them pass it or maxTries
+    boards have been drawn, so a chunk may return fewer lines."""
+    count, seed, maxTries = unit
+    engine = _engine
+    rng = BoggleRandom(seed)
+    rules = rulesFor(engine.rows, engine.cols)
+    minLength = rules.minLength
+    if _filter is None:
+        grid = BoggleGrid(engine.rows, engine.cols)
+
+        def shaken():
+            for i in range(count):
+                grid.shakeCubes(rng=rng)
+                yield grid.tiles
+        boards = shaken()
+    else:
+        # rejected boards are dropped as soon as the search proves it
+        boards = islice(goodBoards(engine, _filter, rng=rng, maxTries=maxTries), count)
+    lines = []
+    for tiles in boards:
+        found = engine.findWords(tiles)
+        words = sum(len(word) >= minLength for word in found)
+        score = rules.scoreWords(found)
+        lines.append('{}\t{}\t{}\n'.format(''.join(tiles), words, score))
+    return ''.join(lines)
+
+
+def workUnits(total, chunkSize, rng, triesPerBoard=None):
+    """Generates the (count, seed, maxTries) work units for total boards,
+    with one independent stream spawned from the BoggleRandom rng per unit
+    and at most triesPerBoard boards drawn per board wanted (no limit if
+    None)"""
+    unit = 0
+    while total > 0:
+        count = min(chunkSize, total)
+        maxTries = count * triesPerBoard if triesPerBoard is not None else None
+        yield count, rng.spawn(unit).seed, maxTries
+        total -= chunkSize
+        unit += 1
+
+
+def run(total, output, workers=None, chunkSize=1000, source='bogwords.txt',
+        rows=4, cols=4, seed=None, boardFilter=None, triesPerBoard=1000):
+    """Generates and solves total boards over workers processes (default:
+    one per core) in chunks of chunkSize, writing results to the open file
+    output as each chunk finishes.  If boardFilter (a BoardFilter) is given
+    only boards that pass it are written, drawing at most triesPerBoard
+    boards for each one wanted.  The same seed always produces the same
+    set of boards.  Returns the number of boards written."""
+    rng = BoggleRandom(seed)
+    # one copy for every worker, without the words the cube set cannot spell
+    lex = loadLexicon(source, cubes=cubesFor(rows, cols))
+    if boardFilter is not None and not boardFilter.isReachable(rows, cols, lexicon=lex):
+        raise ValueError("no {} x {} board can pass {}".format(rows, cols, boardFilter))
+    block = shareLexicon(lex)
+    written = 0
+    try:
+        with Pool(workers or cpu_count(), _initWorker,
+                  (block.name, rows, cols, boardFilter)) as pool:
+            units = workUnits(total, chunkSize, rng,
+                              triesPerBoard if boardFilter is not None else None)
+            for lines in pool.imap_unordered(solveChunk, units):
+                output.write(lines)
+                written += lines.count('\n')
+    finally:
+        block.close()
+        block.unlink()
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('count', type=int, help='number of boards to generate')
+    parser.add_argument('--output', default='-', help='output file (default stdout)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes (default: one per core)')
+    parser.add_argument('--chunk-size', type=int, default=1000,
+                        help='boards per work unit')
+    parser.add_argument('--lexicon', default='bogwords.txt', help='word list')
+    parser.add_argument('--size', type=int, default=4, choices=[4, 5, 6],
+                        help='board size: 4 (classic), 5 (Big) or 6 (Super Big)')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='seed for a reproducible run')
+    parser.add_argument('--min-words', type=int, default=0,
+                        help='skip boards with fewer words')
+    parser.add_argument('--min-score', type=int, default=0,
+                        help='skip boards with a lower maximum score')
+    parser.add_argument('--min-longest', type=int, default=0,
+                        help='skip boards without a word this long')
+    parser.add_argument('--max-tries', type=int, default=1000,
+                        help='with a filter, boards drawn per board wanted before giving up')
+    args = parser.parse_args(argv)
+
+    boardFilter = None
+    if args.min_words or args.min_score or args.min_longest:
+        boardFilter = BoardFilter(args.min_words, args.min_score, args.min_longest,
+                                  rulesFor(args.size, args.size))
+        lex = loadLexicon(args.lexicon, cubes=cubesFor(args.size, args.size))
+        if not boardFilter.isReachable(args.size, args.size, lexicon=lex):
+            parser.error('no {0}x{0} board can have a word of {1} letters'.format(
+                args.size, args.min_longest))
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    start = time.perf_counter()
+    try:
+        written = run(args.count, output, args.workers, args.chunk_size, args.lexicon,
+                      args.size, args.size, args.seed, boardFilter, args.max_tries)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    elapsed = time.perf_counter() - start
+    if written < args.count:
+        print('only {} of {} boards passed the filter within --max-tries'.format(
+            written, args.count), file=sys.stderr)
+    print('{} boards in {:.1f} s ({:.0f} boards/s)'.format(
+        written, elapsed, written / elapsed), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+# script benchmark.py
+"""Times the hot paths of the game: building and loading the lexicon,
+shaking boards, solving boards and validating/storing words.  Each
+benchmark is warmed up, then repeated, and reported with percentiles as
+JSON so runs from different commits can be compared.
+
+    python benchmark.py --repeat 50 --output before.json
+    python benchmark.py --only solve shake
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+from bogglegrid import BoggleGrid
+from bogglelexicon import BoggleLexicon
+from bogglesolver import SolverEngine
+from lexiconcache import loadLexicon
+from myrandom import BoggleRandom
+
+SOURCE = 'bogwords.txt'
+
+
+def percentile(ordered, fraction):
+    """Returns the fraction (0..1) percentile of the sorted list ordered,
+    interpolating between neighbouring samples
+    >>> percentile([1.0, 2.0, 3.0, 4.0], 0.5)
+    2.5
+    """
+    pos = (len(ordered) - 1) * fraction
+    low = int(pos)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+
+def measure(func, repeat=20, warmup=3, number=1):
+    """Calls func warmup times, then times repeat batches of number calls.
+    Returns a dict of per-call statistics in seconds."""
+    for i in range(warmup):
+        func()
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        for j in range(number):
+            func()
+        times.append((time.perf_counter() - start) / number)
+    times.sort()
+    return {'repeat': repeat, 'number': number,
+            'min': times[0], 'mean': sum(times) / len(times),
+            'p50': percentile(times, 0.5), 'p90': percentile(times, 0.9),
+            'p99': percentile(times, 0.99), 'max': times[-1]}
+
+
+# each benchmark returns (func, number): the call to time and how many
+# calls make up one timed batch
+
+def benchLexiconText():
+    """Builds the trie from the text word list"""
+    return (lambda: BoggleLexicon.fromFile(SOURCE)), 1
+
+
+def benchLexiconLoad():
+    """Maps the compiled lexicon cache (hash check included)"""
+    loadLexicon(SOURCE)
+    return (lambda: loadLexicon(SOURCE)), 10
+
+
+def benchShake():
+    """Shakes one 4x4 board"""
+    grid = BoggleGrid()
+    rng = BoggleRandom(1)
+    return (lambda: grid.shakeCubes(rng=rng)), 1000
+
+
+def solveBoards(size):
+    """Returns a benchmark that solves one size x size board, cycling
+    through 100 fixed boards shaken from the cube set for that size"""
+    def bench():
+        engine = SolverEngine(size, size, loadLexicon(SOURCE))
+        boards = []
+        rng = BoggleRandom(2)
+        for i in range(100):
+            grid = BoggleGrid(size, size)
+            grid.shakeCubes(rng=rng)
+            boards.append(grid.tiles)
+        state = {'next': 0}
+
+        def solveNext():
+            engine.findWords(boards[state['next']])
+            state['next'] = (state['next'] + 1) % len(boards)
+        return solveNext, 100
+    bench.__doc__ = "Solves one {0}x{0} board".format(size)
+    return bench
+
+
+def benchSolveCached():
+    """Looks up one 4x4 board, in one of its 8 orientations, in a warm
+    SolveCache"""
+    from solvecache import SolveCache, symmetries
+    cache = SolveCache(SolverEngine(4, 4, loadLexicon(SOURCE)))
+    grid = BoggleGrid()
+    grid.shakeCubes(rng=BoggleRandom(2))
+    boards = [[grid.tiles[i] for i in perm] for perm in symmetries(4, 4)]
+    cache.findWords(boards[0])
+    state = {'next': 0}
+
+    def lookupNext():
+        cache.findWords(boards[state['next']])
+        state['next'] = (state['next'] + 1) % len(boards)
+    return lookupNext, 1000
+
+
+def benchResolveTile():
+    """Changes one tile of a 4x4 board and updates its words incrementally"""
+    from bogglegrid import CUBES
+    from incremental import IncrementalSolver
+    engine = SolverEngine(4, 4, loadLexicon(SOURCE))
+    grid = BoggleGrid()
+    rng = BoggleRandom(2)
+    grid.shakeCubes(rng=rng)
+    solver = IncrementalSolver(engine, grid.tiles)
+    edits = [(rng.randint(0, 15), CUBES[rng.randint(0, 15)][rng.randint(0, 5)])
+             for i in range(1000)]
+    state = {'next': 0}
+
+    def editNext():
+        solver.setTile(*edits[state['next']])
+        state['next'] = (state['next'] + 1) % len(edits)
+    return editNext, 100
+
+
+def benchGrade():
+    """Grades one 50 word submission against a solved 4x4 board"""
+    from grading import Grader
+    lex = loadLexicon(SOURCE)
+    grid = BoggleGrid()
+    rng = BoggleRandom(2)
+    grid.shakeCubes(rng=rng)
+    grader = Grader(SolverEngine(4, 4, lex), grid.tiles, lex)
+    onBoard = sorted(grader.solution) or ['art']
+    extra = ['boggle', 'quiet', 'zebra', 'xq', 'tqe']
+    submissions = [[onBoard[rng.randint(0, len(onBoard) - 1)] for j in range(40)] +
+                   [extra[rng.randint(0, len(extra) - 1)] for j in range(10)]
+                   for i in range(100)]
+    state = {'next': 0}
+
+    def gradeNext():
+        grader.grade(submissions[state['next']])
+        state['next'] = (state['next'] + 1) % len(submissions)
+    return gradeNext, 1000
+
+
+def benchValidate():
+    """Looks up one word (half valid, half not) in the lexicon"""
+    lex = loadLexicon(SOURCE)
+    words = ['quiet', 'boggle', 'zzzz', 'parties', 'qat', 'lamp', 'xylq', 'ar']
+    state = {'next': 0}
+
+    def validateNext():
+        words[state['next']] in lex
+        state['next'] = (state['next'] + 1) % len(words)
+    return validateNext, 1000
+
+
+def benchAddWord():
+    """Spells and stores one word in a BoggleWords holding 500 words"""
+    from bogglewords import BoggleWords
+    letters = [SimpleNamespace(letter=ch) for ch in 'ABCDEFGHIJKLMNOPRSTUVWXYZ']
+    words = BoggleWords([], set(), "")
+    state = {'next': 0}
+
+    def addNext():
+        n = state['next']
+        state['next'] = n + 1
+        words.clearCurrentWord()
+        for digit in '{:04d}'.format(n % 10000):
+            words.addLetter(letters[int(digit)])
+        words.addWord()
+        if n % 500 == 499:
+            words.reset()
+    return addNext, 500
+
+
+BENCHMARKS = {
+    'lexicon_text': benchLexiconText,
+    'lexicon_load': benchLexiconLoad,
+    'shake': benchShake,
+    'solve': solveBoards(4),
+    'solve_5x5': solveBoards(5),
+    'solve_6x6': solveBoards(6),
+    'solve_cached': benchSolveCached,
+    'resolve_tile': benchResolveTile,
+    'grade': benchGrade,
+    'validate': benchValidate,
+    'add_word': benchAddWord,
+}
+
+
+def gitCommit():
+    """Returns the current git commit hash, or None outside a repository"""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(names=None, repeat=20, warmup=3):
+    """Runs the named benchmarks (default: all) and returns the JSON report
+    as a dict"""
+    results = {}
+    for name in names or BENCHMARKS:
+        func, number = BENCHMARKS[name]()
+        results[name] = measure(func, repeat, warmup, number)
+    return {'commit': gitCommit(), 'python': platform.python_version(),
+            'machine': platform.machine(), 'time': time.time(),
+            'results': results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS),
+                        help='benchmarks to run (default: all)')
+    parser.add_argument('--repeat', type=int, default=20, help='timed batches')
+    parser.add_argument('--warmup', type=int, default=3, help='untimed calls first')
+    parser.add_argument('--output', default='-', help='JSON file (default stdout)')
+    args = parser.parse_args(argv)
+
+    report = run(args.only, args.repeat, args.warmup)
+    text = json.dumps(report, indent=2)
+    if args.output == '-':
+        print(text)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    for name, stats in report['results'].items():
+        print('{:<14} p50 {:>10.2f} us  p90 {:>10.2f} us'.format(
+            name, stats['p50'] * 1e6, stats['p90'] * 1e6), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+# Board quality filter
+"""Draws boards until one meets quality thresholds such as a minimum word
+count, a minimum maximum score or a long word, so that nearly unplayable
+boards never reach players."""
+
+from bogglegrid import BoggleGrid, cubesFor
+from scoring import CLASSIC
+import myrandom
+
+
+class BoardFilter:
+    """Quality thresholds for a board, with attributes:
+       *  _minWords (int) is the fewest scoring words (of at least the
+          rules' minimum length) the board must hold
+       *  _minScore (int) is the lowest acceptable maximum score
+       *  _minLongest (int) is the length the longest word must reach
+       *  _rules is the ScoringRules used for the score and word count
+          thresholds
+    A threshold of 0 is not checked.
+    >>> from bogglesolver import SolverEngine
+    >>> from bogglelexicon import BoggleLexicon
+    >>> engine = SolverEngine(2, 2, BoggleLexicon.fromWords(["art", "rat", "tar"]))
+    >>> BoardFilter(minWords=2).accepts(engine, ["P", "A", "R", "T"])
+    True
+    >>> BoardFilter(minWords=2, minLongest=4).accepts(engine, ["P", "A", "R", "T"])
+    False
+    >>> from scoring import BIG      # three letter words do not count
+    >>> BoardFilter(minWords=1, rules=BIG).accepts(engine, ["P", "A", "R", "T"])
+    False
+    """
+
+    __slots__ = ['_minWords', '_minScore', '_minLongest', '_rules']
+
+    def __init__(self, minWords=0, minScore=0, minLongest=0, rules=CLASSIC):
+        self._minWords = minWords
+        self._minScore = minScore
+        self._minLongest = minLongest
+        self._rules = rules
+
+    # getter methods for attributes
+    @property
+    def minWords(self):
+        return self._minWords
+
+    @property
+    def minScore(self):
+        return self._minScore
+
+    @property
+    def minLongest(self):
+        return self._minLongest
+
+    def isMet(self, words):
+        """Returns True if the collection of words meets every threshold"""
+        minLength = self._rules.minLength
+        return (sum(len(word) >= minLength for word in words) >= self._minWords and
+                self._rules.scoreWords(words) >= self._minScore and
+                max(map(len, words), default=0) >= self._minLongest)
+
+    def tracker(self):
+        """Returns a stop callback for SolverEngine.findWords that keeps
+        running totals of the words it is given and returns True once every
+        threshold is met"""
+        state = [0, 0, 0]   # words, score, longest
+        scoreWord = self._rules.scoreWord
+        minLength = self._rules.minLength
+        minWords, minScore, minLongest = self._minWords, self._minScore, self._minLongest
+
+        def stop(word):
+            if len(word) >= minLength:
+                state[0] += 1
+            state[1] += scoreWord(word)
+            if len(word) > state[2]:
+                state[2] = len(word)
+            return state[0] >= minWords and state[1] >= minScore and state[2] >= minLongest
+        return stop
+
+    def isReachable(self, rows, cols, cubes=None, lexicon=None):
+        """Returns False if no rows x cols board shaken from cubes (by
+        default the cube set for that size) can pass, because the longest
+        word required has more letters than the board can show, or than the
+        longest word in the BoggleLexicon lexicon (if given)
+        >>> from bogglelexicon import BoggleLexicon
+        >>> BoardFilter(minLongest=17).isReachable(4, 4)    # 15 cubes and Qu
+        True
+        >>> BoardFilter(minLongest=18).isReachable(4, 4)
+        False
+        >>> BoardFilter(minLongest=6).isReachable(4, 4, lexicon=BoggleLexicon.fromWords(["party"]))
+        False
+        """
+        if cubes is None:
+            cubes = cubesFor(rows, cols)
+        longest = sorted((max(len(face) for face in cube) for cube in cubes), reverse=True)
+        if self._minLongest > sum(longest[:rows * cols]):
+            return False
+        if lexicon is not None and self._minLongest > max(map(len, lexicon.words()), default=0):
+            return False
+        return True
+
+    def accepts(self, engine, tiles):
+        """Returns True if the board with row major tile strings tiles meets
+        every threshold.  The SolverEngine engine stops searching as soon as
+        the thresholds are proven met."""
+        if not (self._minWords or self._minScore or self._minLongest):
+            return True
+        if self._minLongest > sum(len(tile) for tile in tiles):
+            return False    # no path can spell a word that long
+        stop = self.tracker()
+        found = engine.findWords(tiles, stop)
+        return self.isMet(found)
+
+    def __repr__(self):
+        return "BoardFilter(minWords={}, minScore={}, minLongest={}, rules={})".format(
+            self._minWords, self._minScore, self._minLongest, self._rules.name)
+
+
+def goodBoards(engine, boardFilter, cubes=None, rng=None, maxTries=None):
+    """Generates row major tile lists of boards shaken from cubes (by default
+    the cube set for the engine's board size) with the
+    BoggleRandom rng that pass boardFilter, solving with the SolverEngine
+    engine.  Stops after maxTries boards have been drawn, if given."""
+    if rng is None:
+        rng = myrandom.default()
+    grid = BoggleGrid(engine.rows, engine.cols)
+    tries = 0
+    while maxTries is None or tries < maxTries:
+        tries += 1
+        grid.shakeCubes(cubes, rng)
+        if boardFilter.accepts(engine, grid.tiles):
+            yield list(grid.tiles)
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
+
+    import time
+    from itertools import islice
+    from bogglesolver import SolverEngine
+    from lexiconcache import loadLexicon
+    engine = SolverEngine(4, 4, loadLexicon())
+    boardFilter = BoardFilter(minWords=60, minScore=80, minLongest=7)
+    start = time.perf_counter()
+    boards = list(islice(goodBoards(engine, boardFilter), 200))
+    elapsed = time.perf_counter() - start
+    print("{} after {} solves: {:.0f} filtered boards/s".format(
+        boardFilter, engine.boardsSolved, len(boards) / elapsed))
@@ -3,46 +3,52 @@
 
 # import modules and classes
 from graphics import *
-from myrandom import randint
+from bogglegrid import BoggleGrid, CUBES
 from boggleletter import BoggleLetter
 from board import Board
 
-# global variable to represent letters that can go on a boggle cube
-CUBES =   [[ "A", "A", "C", "I", "O", "T" ],
-           [ "T", "Y", "A", "B", "I", "L" ],
-           [ "J", "M", "O", "Qu", "A", "B"],
-           [ "A", "C", "D", "E", "M", "P" ],
-           [ "A", "C", "E", "L", "S", "R" ],
-           [ "A", "D", "E", "N", "V", "Z" ],
-           [ "A", "H", "M", "O", "R", "S" ],
-           [ "B", "F", "I", "O", "R", "X" ],
-           [ "D", "E", "N", "O", "S", "W" ],
-           [ "D", "K", "N", "O", "T", "U" ],
-           [ "E", "E", "F", "H", "I", "Y" ],
-           [ "E", "G", "I", "N", "T", "V" ],
-           [ "E", "G", "K", "L", "U", "Y" ],
-           [ "E", "H", "I", "N", "P", "S" ],
-           [ "E", "L", "P", "S", "T", "U" ],
-           [ "G", "I", "L", "R", "U", "W" ]]
-
-
 class BoggleBoard(Board):
     """Boggle Board class implements the functionality of a Boggle board.
     It inherits from the Board class and extends it by creating a grid
-    of BoggleLetters, shaken appropriately to randomize play."""
-
-    __slots__ = ['_grid']
-
-    def __init__(self):
-        super().__init__() # initialize attributes from parent class
-
+    of BoggleLetters, shaken appropriately to randomize play.  The letters
+    themselves live in a headless BoggleGrid (_model); the BoggleLetters
+    are views that draw it.
+
+    In batched mode (see setBatched) letters and text areas only record
+    what changed; the changes are copied to the window once, by render(),
+    which is scheduled to run when Tk is next idle.  Use it with a GraphWin
+    created with autoflush=False so each change does not update the window."""
+
+    __slots__ = ['_grid', '_model', '_win', '_batched', '_renderPending',
+                 '_pendingText']
+
+    def __init__(self, rows=4, cols=4):
+        # shrink the squares of larger boards to fit the same window area
+        size = 200 // max(rows, cols)
+        super().__init__(rows=rows, cols=cols, size=size) # initialize attributes from parent class
+
+        self._model = BoggleGrid(self.rows, self.cols) # letters on the board
+        self._win = None                # window drawn on, set by drawBoard
+        self._batched = False
+        self._renderPending = False     # True once a render is scheduled
+        self._pendingText = {}          # Text object -> text to show
         self._grid = [] # initialize grid attribute
 
         # initialize grid positions with BoggleLetter objects
         for cols in range(self.cols):
-            colLetters = [BoggleLetter(cols, rows, '') for rows in range(self.rows)]
+            colLetters = [BoggleLetter(cols, rows, '', size=self.size) for rows in range(self.rows)]
             self._grid.append(colLetters)
 
+    @property
+    def model(self):
+        """Returns the BoggleGrid holding the letters on the board"""
+        return self._model
+
+    @property
+    def tiles(self):
+        """Returns the row major list of letters on the board"""
+        return self._model.tiles
+
     def getLetterObj(self, pos):
         """Returns the letter object (that is, a BoggleLetter)
         at given grid position pos, a tuple of (column, row)"""
@@ -52,15 +58,98 @@ class BoggleBoard(Board):
     def getLetter(self, pos):
         """Returns the text (string) of the BoggleLetter
         at given position pos, a tuple of (column, row)"""
-        letObj = self.getLetterObj(pos) # get BoggleLetter at position
-        return letObj.letter            # get letter from BoggleLetter
+        return self._model.getLetter(pos) # get letter from the model
 
     def setLetter(self, pos, alph):
         """Given grid position pos, a tuple of (column, row),
         set the text of the BoggleLetter at that position to alph (a string)"""
+        self._model.setLetter(pos, alph) # update the model
         letObj = self.getLetterObj(pos) # get BoggleLetter at position
         letObj.letter = alph            # set letter of BoggleLetter
 
+    def inGrid(self, point):
+        """Returns True if a Point (point) exists inside the grid of squares.
+        Overrides Board.inGrid, which assumes the insets equal the square size."""
+        ptX = point.getX()
+        ptY = point.getY()
+        return self.xInset <= ptX < self.xInset + self.size * self.cols and \
+            self.yInset <= ptY < self.yInset + self.size * self.rows
+
+    def setLowerTextColor(self, color):
+        """Sets the color of the text area below grid to color (str)"""
+        if self._lowerWord.config['fill'] != color:
+            self._lowerWord.setTextColor(color)
+
+    # batched rendering
+    def setBatched(self, batched=True):
+        """Turns batched rendering on or off.  Turning it off renders any
+        pending changes first."""
+        if not batched:
+            self.render()
+        self._batched = batched
+        onChange = self._requestRender if batched else None
+        for colLetters in self._grid:
+            for bLet in colLetters:
+                bLet.setBatched(onChange)
+
+    def _requestRender(self):
+        """Schedules render() for when Tk is next idle, once per frame"""
+        if not self._renderPending and self._win is not None:
+            self._renderPending = True
+            self._win.after_idle(self.render)
+
+    def render(self):
+        """Copies every pending letter and text change to the window"""
+        self._renderPending = False
+        for textObj, text in self._pendingText.items():
+            if textObj.getText() != text:
+                textObj.setText(text)
+        self._pendingText = {}
+        for colLetters in self._grid:
+            for bLet in colLetters:
+                bLet.render()
+
+    def _setText(self, textObj, text):
+        """Sets the text of textObj now, or at the next render in batched mode"""
+        if self._batched:
+            self._pendingText[textObj] = text
+            self._requestRender()
+        elif textObj.getText() != text:
+            textObj.setText(text)
+
+    def _getText(self, textObj):
+        """Returns the text textObj shows, including a pending change"""
+        return self._pendingText.get(textObj, textObj.getText())
+
+    # text areas, overridden to skip unchanged text and support batching
+    def setTextArea(self, text):
+        """Sets text to text area to right of grid."""
+        self._setText(self._textArea, text)
+
+    def clearTextArea(self):
+        """Clear text in text area to right of grid."""
+        self._setText(self._textArea, "")
+
+    def addStringToLowerText(self, text):
+        """Add text to text area below grid."""
+        self._setText(self._lowerWord, self._getText(self._lowerWord) + text)
+
+    def setStringToLowerText(self, text):
+        """Set text to text area below grid."""
+        self._setText(self._lowerWord, text)
+
+    def clearLowerText(self):
+        """Clear text area below grid."""
+        self._setText(self._lowerWord, "")
+
+    def setStringToUpperText(self, text):
+        """Set text to text area above grid."""
+        self._setText(self._upperWord, text)
+
+    def clearUpperText(self):
+        """Clear text area above grid."""
+        self._setText(self._upperWord, "")
+
     def clearLetters(self):
         """Unclicks all boggle letters on the board without changing any other attribute"""
         # traverse the grid
@@ -74,14 +163,12 @@ class BoggleBoard(Board):
         clears all text areas (right, lower, upper) on board
         and resets the letters on board by calling shakeCubes"""
 
-        # traverse the grid and set each BoggleLetter object to an empty string
+        # traverse the grid and unclick each BoggleLetter object
         for cols in range (self.cols):
             for rows in range(self.rows):
-                bLet = self._grid[cols][rows]
-                bLet.unclick()
-                bLet.textObj.setText("")
+                self._grid[cols][rows].unclick()
 
-        self.shakeCubes() # shake the cubes
+        self.shakeCubes() # shake the cubes, which sets every letter
 
         # clear text areas
         self.clearTextArea()
@@ -91,6 +178,8 @@ class BoggleBoard(Board):
     def drawBoard(self, win):
         """Draws the boggle board with all the letters on it.
         Overrides inherited drawBoard method of super class"""
+        self._win = win
+        self.render()          # draw with any pending changes applied
         super().drawBoard(win) # call drawBoard from the parent class
 
         # traverse the grid and 'draw' each BoggleLetter object
@@ -99,30 +188,16 @@ class BoggleBoard(Board):
                 bLet = self._grid[cols][rows]
                 bLet.textObj.draw(win)
 
-    def shakeCubes(self):
+    def shakeCubes(self, rng=None):
         """Shakes the boggle board and sets letters
-        as described by the handout."""
-        count = 0 # initialize
+        as described by the handout.  rng is an optional BoggleRandom
+        (see myrandom) used to reproduce a board from its seed."""
+        self._model.shakeCubes(rng=rng) # shake the cubes in the model
 
-        # traverse the grid
+        # update each BoggleLetter to show its new letter
         for rows in range(self.rows):
             for cols in range(self.cols):
-
-                # randomize cube and side number
-                cubeNumber = randint(0, self.rows * self.cols - 1 - count)
-                sideNumber = randint(0, 5)
-
-                # set grid letter from randomly selected cube side
-                letter = CUBES[cubeNumber][sideNumber]
-                self.setLetter((cols, rows), letter)
-
-                # swap rows to avoid reusing cube
-                temp = CUBES[cubeNumber]
-                CUBES[cubeNumber] = CUBES[15 - count]
-                CUBES[15 - count] = temp
-
-                # update count
-                count = count + 1
+                self._grid[cols][rows].letter = self._model.getLetter((cols, rows))
 
     def __str__(self):
         """ Returns a string representation of this BoggleBoard """
@@ -0,0 +1,266 @@
+# BoggleGrid class
+"""Implements a headless Boggle board model: a compact list of tile strings
+plus the cube and face each tile was rolled from.  It has no graphics
+dependency, so boards can be generated and solved without Tk."""
+
+import myrandom
+
+# global variable to represent letters that can go on a boggle cube
+CUBES =   [[ "A", "A", "C", "I", "O", "T" ],
+           [ "T", "Y", "A", "B", "I", "L" ],
+           [ "J", "M", "O", "Qu", "A", "B"],
+           [ "A", "C", "D", "E", "M", "P" ],
+           [ "A", "C", "E", "L", "S", "R" ],
+           [ "A", "D", "E", "N", "V", "Z" ],
+           [ "A", "H", "M", "O", "R", "S" ],
+           [ "B", "F", "I", "O", "R", "X" ],
+           [ "D", "E", "N", "O", "S", "W" ],
+           [ "D", "K", "N", "O", "T", "U" ],
+           [ "E", "E", "F", "H", "I", "Y" ],
+           [ "E", "G", "I", "N", "T", "V" ],
+           [ "E", "G", "K", "L", "U", "Y" ],
+           [ "E", "H", "I", "N", "P", "S" ],
+           [ "E", "L", "P", "S", "T", "U" ],
+           [ "G", "I", "L", "R", "U", "W" ]]
+
+# Big Boggle (5x5) cubes; "Qu" is a single face
+BIG_CUBES =   [[ "A", "A", "A", "F", "R", "S" ],
+               [ "A", "A", "E", "E", "E", "E" ],
+               [ "A", "A", "F", "I", "R", "S" ],
+               [ "A", "D", "E", "N", "N", "N" ],
+               [ "A", "E", "E", "E", "E", "M" ],
+               [ "A", "E", "E", "G", "M", "U" ],
+               [ "A", "E", "G", "M", "N", "N" ],
+               [ "A", "F", "I", "R", "S", "Y" ],
+               [ "B", "J", "K", "Qu", "X", "Z" ],
+               [ "C", "C", "E", "N", "S", "T" ],
+               [ "C", "E", "I", "I", "L", "T" ],
+               [ "C", "E", "I", "L", "P", "T" ],
+               [ "C", "E", "I", "P", "S", "T" ],
+               [ "D", "D", "H", "N", "O", "T" ],
+               [ "D", "H", "H", "L", "O", "R" ],
+               [ "D", "H", "L", "N", "O", "R" ],
+               [ "D", "H", "L", "N", "O", "R" ],
+               [ "E", "I", "I", "I", "T", "T" ],
+               [ "E", "M", "O", "T", "T", "T" ],
+               [ "E", "N", "S", "S", "S", "U" ],
+               [ "F", "I", "P", "R", "S", "Y" ],
+               [ "G", "O", "R", "R", "V", "W" ],
+               [ "I", "P", "R", "R", "R", "Y" ],
+               [ "N", "O", "O", "T", "U", "W" ],
+               [ "O", "O", "O", "T", "T", "U" ]]
+
+# Super Big Boggle (6x6) cubes, with two-letter faces and blank ("") faces
+SUPER_CUBES =   [[ "A", "A", "A", "F", "R", "S" ],
+                 [ "A", "A", "E", "E", "E", "E" ],
+                 [ "A", "A", "E", "E", "O", "O" ],
+                 [ "A", "A", "F", "I", "R", "S" ],
+                 [ "A", "B", "D", "E", "I", "O" ],
+                 [ "A", "D", "E", "N", "N", "N" ],
+                 [ "A", "E", "E", "E", "E", "M" ],
+                 [ "A", "E", "E", "G", "M", "U" ],
+                 [ "A", "E", "G", "M", "N", "N" ],
+                 [ "A", "E", "I", "L", "M", "N" ],
+                 [ "A", "E", "I", "N", "O", "U" ],
+                 [ "A", "F", "I", "R", "S", "Y" ],
+                 [ "An", "Er", "He", "In", "Qu", "Th" ],
+                 [ "B", "B", "J", "K", "X", "Z" ],
+                 [ "C", "C", "E", "N", "S", "T" ],
+                 [ "C", "D", "D", "L", "N", "N" ],
+                 [ "C", "E", "I", "I", "T", "T" ],
+                 [ "C", "E", "I", "P", "S", "T" ],
+                 [ "C", "F", "G", "N", "U", "Y" ],
+                 [ "D", "D", "H", "N", "O", "T" ],
+                 [ "D", "H", "H", "L", "O", "R" ],
+                 [ "D", "H", "H", "N", "O", "W" ],
+                 [ "D", "H", "L", "N", "O", "R" ],
+                 [ "E", "H", "I", "L", "R", "S" ],
+                 [ "E", "I", "I", "L", "S", "T" ],
+                 [ "E", "I", "L", "P", "S", "T" ],
+                 [ "E", "I", "O", "", "", "" ],
+                 [ "E", "M", "T", "T", "T", "O" ],
+                 [ "E", "N", "S", "S", "S", "U" ],
+                 [ "G", "O", "R", "R", "V", "W" ],
+                 [ "H", "I", "R", "S", "T", "V" ],
+                 [ "H", "O", "P", "R", "S", "T" ],
+                 [ "I", "P", "R", "S", "Y", "Y" ],
+                 [ "J", "K", "Qu", "W", "X", "Z" ],
+                 [ "N", "O", "O", "T", "U", "W" ],
+                 [ "O", "O", "O", "T", "T", "U" ]]
+
+# cube set for each supported (rows, cols) board size
+CUBE_SETS = {(4, 4): CUBES, (5, 5): BIG_CUBES, (6, 6): SUPER_CUBES}
+
+
+def cubesFor(rows, cols):
+    """Returns the cube set for a rows x cols board
+    >>> len(cubesFor(5, 5)), len(cubesFor(6, 6))
+    (25, 36)
+    """
+    try:
+        return CUBE_SETS[(rows, cols)]
+    except KeyError:
+        raise ValueError("no cube set for a {} x {} board".format(rows, cols))
+
+# compact tile codes, used when boards are stored as arrays of small ints
+TILES = [chr(ord("A") + i) for i in range(26)] + ["Qu", "An", "Er", "He", "In", "Th", ""]
+TILE_CODES = {tile: code for code, tile in enumerate(TILES)}
+
+
+def encodeTiles(tiles):
+    """Returns the list of tile codes for a list of tile strings
+    >>> encodeTiles(["A", "Qu", "Z"])
+    [0, 26, 25]
+    """
+    return [TILE_CODES[tile] for tile in tiles]
+
+
+def decodeTiles(codes):
+    """Returns the list of tile strings for a sequence of tile codes
+    >>> decodeTiles([0, 26, 25])
+    ['A', 'Qu', 'Z']
+    """
+    return [TILES[code] for code in codes]
+
+
+class BoggleGrid:
+    """A BoggleGrid stores the state of a rows x cols Boggle board:
+       *  _tiles is a row major list of tile strings ("A", "Qu", ...)
+       *  _cubes is a row major list of the index into the cube set of the
+          cube on each cell, or -1 if the tile was set by hand
+       *  _faces is a row major list of the face index rolled on each cube
+    Positions are tuples of (col, row), as in the Board class.
+    >>> grid = BoggleGrid(2, 2)
+    >>> grid.setLetter((1, 0), "Qu")
+    >>> grid.getLetter((1, 0)), grid.tiles
+    ('Qu', ['', 'Qu', '', ''])
+    >>> grid.shakeCubes(CUBES[:4])
+    >>> all(grid.getLetter((c, r)) == CUBES[grid.cubes[r * 2 + c]][grid.faces[r * 2 + c]]
+    ...     for r in range(2) for c in range(2))
+    True
+    """
+
+    __slots__ = ['_rows', '_cols', '_tiles', '_cubes', '_faces']
+
+    def __init__(self, rows=4, cols=4, tiles=None):
+        self._rows = rows
+        self._cols = cols
+        self._tiles = list(tiles) if tiles is not None else [''] * (rows * cols)
+        self._cubes = [-1] * (rows * cols)
+        self._faces = [-1] * (rows * cols)
+
+    # getter methods for attributes
+    @property
+    def rows(self):
+        return self._rows
+
+    @property
+    def cols(self):
+        return self._cols
+
+    @property
+    def tiles(self):
+        """Returns the row major list of tile strings"""
+        return self._tiles
+
+    @property
+    def cubes(self):
+        """Returns the row major list of cube indices"""
+        return self._cubes
+
+    @property
+    def faces(self):
+        """Returns the row major list of face indices"""
+        return self._faces
+
+    def index(self, pos):
+        """Returns the row major index of grid position pos, a tuple of (col, row)"""
+        return pos[1] * self._cols + pos[0]
+
+    def getLetter(self, pos):
+        """Returns the tile string at grid position pos, a tuple of (column, row)"""
+        return self._tiles[pos[1] * self._cols + pos[0]]
+
+    def setLetter(self, pos, alph):
+        """Given grid position pos, a tuple of (column, row), sets the tile
+        at that position to alph (a string)"""
+        idx = pos[1] * self._cols + pos[0]
+        self._tiles[idx] = alph
+        self._cubes[idx] = -1
+        self._faces[idx] = -1
+
+    def clear(self):
+        """Sets every tile to the empty string"""
+        size = self._rows * self._cols
+        self._tiles[:] = [''] * size
+        self._cubes[:] = [-1] * size
+        self._faces[:] = [-1] * size
+
+    def shakeCubes(self, cubes=None, rng=None):
+        """Places a randomly ordered cube from cubes (by default the cube set
+        for the board's size) on every cell and rolls a random face of each,
+        drawing from the BoggleRandom rng (by default the myrandom module's
+        stream).  cubes must hold at least one cube per cell, each with the
+        same number of faces.
+        >>> from myrandom import BoggleRandom
+        >>> a, b = BoggleGrid(), BoggleGrid()
+        >>> a.shakeCubes(rng=BoggleRandom(7)); b.shakeCubes(rng=BoggleRandom(7))
+        >>> a.tiles == b.tiles and sorted(a.cubes) == list(range(16))
+        True
+        >>> big = BoggleGrid(5, 5); big.shakeCubes(); sorted(big.cubes) == list(range(25))
+        True
+        """
+        if cubes is None:
+            cubes = cubesFor(self._rows, self._cols)
+        if rng is None:
+            rng = myrandom.default()
+        size = self._rows * self._cols
+        if len(cubes) < size:
+            raise ValueError("{} cubes cannot fill {} cells".format(len(cubes), size))
+
+        # randomize cube order and side numbers in two calls
+        order = list(range(len(cubes)))
+        rng.shuffle(order)
+        del order[size:]
+        faces = rng.randints(0, len(cubes[0]) - 1, size)
+
+        self._tiles[:] = [cubes[cube][face] for cube, face in zip(order, faces)]
+        self._cubes[:] = order
+        self._faces[:] = faces
+
+    def placeCubes(self, order, faces, cubes=None):
+        """Places cube order[i] of cubes (by default the cube set for the
+        board's size) on cell i, showing face faces[i], for every cell in
+        row major order.  Raises ValueError if a cube is used twice.
+        >>> grid = BoggleGrid(1, 2)
+        >>> grid.placeCubes([3, 0], [2, 5], CUBES); grid.tiles
+        ['D', 'T']
+        """
+        if cubes is None:
+            cubes = cubesFor(self._rows, self._cols)
+        size = self._rows * self._cols
+        order = list(order[:size])
+        faces = list(faces[:size])
+        if len(set(order)) != size or len(faces) != size:
+            raise ValueError("need {} different cubes and faces".format(size))
+        self._tiles[:] = [cubes[cube][face] for cube, face in zip(order, faces)]
+        self._cubes[:] = order
+        self._faces[:] = faces
+
+    def __str__(self):
+        """Returns a string representation of this BoggleGrid, one row per line"""
+        return '\n'.join(' '.join('{:<2}'.format(tile or '.') for tile in
+                                  self._tiles[r * self._cols:(r + 1) * self._cols]).rstrip()
+                         for r in range(self._rows))
+
+    def __repr__(self):
+        return "BoggleGrid({}, {}, {})".format(self._rows, self._cols, self._tiles)
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
+
+    grid = BoggleGrid()
+    grid.shakeCubes()
+    print(grid)
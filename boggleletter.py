@@ -7,25 +7,37 @@ from graphics import *
 class BoggleLetter:
     """A Boggle letter has several attributes that define it:
        *  _row, _col coordinates indicate its position in the grid (ints)
+       *  _letter (str) is the letter shown on the tile; reads come from
+          here rather than from the Text object
        *  _textObj denotes the Text object from the graphics module,
           which has attributes such as size, style, color, etc
           and supports methods such as getText(), setText() etc.
        *  _color (str) denotes the color attribute:  a boggle letter turns
           blue when clicked, and is black by default or when unclicked.
           In a continuing word, previously clicked letters are green.
+       *  _onChange is None when changes are drawn immediately; in batched
+          mode it is a function called when the letter becomes _dirty, and
+          the Text object is only updated by render()
+       *  _dirty (bool) is True if letter or color changed since render()
     """
 
     # add more attributes if needed!
-    __slots__ = ['_col', '_row', '_textObj', '_color']
+    __slots__ = ['_col', '_row', '_letter', '_textObj', '_color',
+                 '_onChange', '_dirty']
 
-    def __init__(self, col=-1, row=-1, letter="", color="black"):
+    def __init__(self, col=-1, row=-1, letter="", color="black", size=50):
         # needed for standalone testing (can safely ignore)
-        xInset = 50; yInset = 50; size = 50
+        xInset = 50; yInset = 50
 
         # set row and column attributes
         self._col = col
         self._row = row
 
+        self._letter = letter
+        self._color = None
+        self._onChange = None
+        self._dirty = False
+
         # call textObj setter
         self.textObj = Text(Point(xInset + size * col + size / 2,
                                   yInset + size * row + size / 2), letter)
@@ -41,8 +53,8 @@ class BoggleLetter:
 
     @property
     def letter(self):
-        """Returns letter (text of type str) associated with property textObj"""
-        return self.textObj.getText()
+        """Returns letter (text of type str) shown by property textObj"""
+        return self._letter
 
     @property
     def col(self):
@@ -69,9 +81,15 @@ class BoggleLetter:
     # setter methods for BoggleLetter class
     @letter.setter
     def letter(self, char):
-        """Sets the text on the BoggleLetter to char (str) by setting the text
-        of the Text object"""
-        self.textObj.setText(char)
+        """Sets the text on the BoggleLetter to char (str) and updates the text
+        of the Text object (or marks it dirty in batched mode)"""
+        if char == self._letter:
+            return
+        self._letter = char
+        if self._onChange is None:
+            self.textObj.setText(char)
+        else:
+            self._markDirty()
 
     @textObj.setter
     def textObj(self, textObj, size=20, style="bold"):
@@ -84,9 +102,37 @@ class BoggleLetter:
     @color.setter
     def color(self, col):
         """Sets color of letter by modifying _color and _textObj
-        attributes appropriately."""
-        self._color = col               # modify _color
-        self.textObj.setTextColor(col)  # modify _textObj
+        attributes appropriately (or marks it dirty in batched mode)."""
+        if col == self._color:
+            return
+        self._color = col                   # modify _color
+        if self._onChange is None:
+            self.textObj.setTextColor(col)  # modify _textObj
+        else:
+            self._markDirty()
+
+    # batched rendering
+    def setBatched(self, onChange):
+        """Switches to batched mode, calling onChange (a function of no
+        arguments) whenever the letter first becomes dirty.  Passing None
+        renders any pending change and switches back to immediate mode."""
+        if onChange is None:
+            self.render()
+        self._onChange = onChange
+
+    def _markDirty(self):
+        if not self._dirty:
+            self._dirty = True
+            self._onChange()
+
+    def render(self):
+        """Copies a pending letter and color change to the Text object"""
+        if self._dirty:
+            self._dirty = False
+            if self.textObj.getText() != self._letter:
+                self.textObj.setText(self._letter)
+            if self.textObj.config['fill'] != self._color:
+                self.textObj.setTextColor(self._color)
 
     # click and unclick methods that are useful in play
     def unclick(self):
@@ -0,0 +1,180 @@
+# BoggleLexicon class
+"""Implements a prefix tree (trie) over the Boggle lexicon that answers
+word, prefix and next-letter queries in time proportional to the length
+of the query."""
+
+from array import array
+
+ROOT = 0                # node index of the empty prefix
+NO_NODE = -1            # returned by step() when a prefix is a dead end
+TERMINAL = 1 << 26      # node mask bit set when the prefix is a whole word
+LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+
+
+class BoggleLexicon:
+    """A BoggleLexicon stores the lexicon as a flattened trie made of two
+    parallel arrays, indexed by node number:
+       *  _masks holds a 26 bit mask of the letters that can follow the node,
+          plus the TERMINAL bit if the node ends a word.
+       *  _firsts holds the index of the node's first child.  Children are
+          stored contiguously in alphabetical order, so the child for a
+          letter is found by counting the mask bits below it.
+    Tiles may hold more than one letter (the "Qu" tile), in which case
+    step() walks one node per letter.
+    >>> lex = BoggleLexicon.fromWords(["quit", "quiet", "art"])
+    >>> lex.isWord("quit"), lex.isWord("qui"), lex.isPrefix("qui")
+    (True, False, True)
+    >>> lex.nextLetters("qui")
+    ['e', 't']
+    >>> lex.isTerminal(lex.step(lex.step(ROOT, "Qu"), "IT"))
+    True
+    >>> "ART" in lex, len(lex)
+    (True, 3)
+    """
+
+    __slots__ = ['_masks', '_firsts', '_size']
+
+    def __init__(self, masks, firsts, size=None):
+        """Initializes attributes from the flattened trie arrays (arrays or
+        memoryviews of unsigned ints)"""
+        self._masks = masks
+        self._firsts = firsts
+        if size is None:
+            size = sum(1 for m in masks if m & TERMINAL)
+        self._size = size
+
+    @classmethod
+    def fromWords(cls, words):
+        """Builds a BoggleLexicon from an iterable of words.  Words holding
+        anything but the letters a to z (such as "don't") cannot be spelled
+        on a board and are skipped.
+        >>> lex = BoggleLexicon.fromWords(["don't", "ab{c", "café", "Art"])
+        >>> len(lex), lex.isWord("ab"), lex.isWord("art")
+        (1, False, True)
+        """
+        root = {}
+        size = 0
+        for word in words:
+            word = word.strip().lower()
+            if not (word.isascii() and word.isalpha()):
+                continue
+            node = root
+            for ch in word:
+                node = node.setdefault(ch, {})
+            if None not in node:
+                node[None] = True    # mark end of word
+                size += 1
+
+        # flatten breadth first so each node's children sit side by side
+        masks = array('I')
+        firsts = array('I')
+        queue = [root]
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            mask = TERMINAL if None in node else 0
+            firsts.append(len(queue))
+            for ch in sorted(k for k in node if k is not None):
+                mask |= 1 << (ord(ch) - 97)
+                queue.append(node[ch])
+            masks.append(mask)
+        return cls(masks, firsts, size)
+
+    @classmethod
+    def fromFile(cls, filename='bogwords.txt'):
+        """Reads words (one per line) from filename and builds a BoggleLexicon"""
+        with open(filename) as f:
+            return cls.fromWords(f)
+
+    # getter methods for the flattened trie
+    @property
+    def masks(self):
+        """Returns the node mask array"""
+        return self._masks
+
+    @property
+    def firsts(self):
+        """Returns the first-child index array"""
+        return self._firsts
+
+    @property
+    def nodeCount(self):
+        """Returns the number of nodes in the trie"""
+        return len(self._masks)
+
+    # node level queries, used by the solver
+    def step(self, node, tile):
+        """Returns the node reached by following the letters of tile (str)
+        from node, or NO_NODE if no word continues that way"""
+        masks = self._masks
+        for ch in tile.lower():
+            if node < 0:
+                return NO_NODE
+            idx = ord(ch) - 97
+            if not 0 <= idx < 26:
+                return NO_NODE
+            mask = masks[node]
+            bit = 1 << idx
+            if not mask & bit:
+                return NO_NODE
+            node = self._firsts[node] + (mask & (bit - 1)).bit_count()
+        return node
+
+    def isTerminal(self, node):
+        """Returns True if node ends a word"""
+        return node >= 0 and bool(self._masks[node] & TERMINAL)
+
+    def children(self, node):
+        """Returns a list of (letter, node) pairs that follow node"""
+        mask = self._masks[node] & (TERMINAL - 1)
+        child = self._firsts[node]
+        result = []
+        for idx in range(26):
+            if mask & (1 << idx):
+                result.append((LETTERS[idx], child))
+                child += 1
+        return result
+
+    # string level queries
+    def isWord(self, word):
+        """Returns True if word (str) is in the lexicon"""
+        return self.isTerminal(self.step(ROOT, word))
+
+    def isPrefix(self, prefix):
+        """Returns True if some word in the lexicon starts with prefix (str)"""
+        return self.step(ROOT, prefix) >= 0
+
+    def nextLetters(self, prefix):
+        """Returns the letters (in alphabetical order) that can follow prefix"""
+        node = self.step(ROOT, prefix)
+        if node < 0:
+            return []
+        return [letter for letter, child in self.children(node)]
+
+    def words(self, node=ROOT, prefix=''):
+        """Generates the words below node in alphabetical order"""
+        if self._masks[node] & TERMINAL:
+            yield prefix
+        for letter, child in self.children(node):
+            yield from self.words(child, prefix + letter)
+
+    def __contains__(self, word):
+        return self.isWord(word)
+
+    def __len__(self):
+        return self._size
+
+    def __repr__(self):
+        """String representation of BoggleLexicon"""
+        return "BoggleLexicon({} words, {} nodes)".format(self._size, self.nodeCount)
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
+
+    lex = BoggleLexicon.fromFile()
+    print(lex)
+    print("quiet: {}, qui: {}, after 'aba': {}".format(
+        lex.isWord("quiet"), lex.isPrefix("qui"), lex.nextLetters("aba")))
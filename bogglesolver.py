@@ -0,0 +1,212 @@
+# Boggle solver
+"""Finds every word in the lexicon that can be traced on a Boggle board."""
+
+from functools import lru_cache
+from time import perf_counter
+from bogglelexicon import BoggleLexicon, ROOT, NO_NODE, TERMINAL
+from scoring import CLASSIC
+
+MIN_LENGTH = 3  # shortest word that counts in Boggle
+DEAD = 27       # letter index of a tile no word can use
+
+
+class _StopSearch(Exception):
+    """Raised inside the search to unwind it when a stop callback is satisfied"""
+
+
+class SolvedWord:
+    """A word found on the board, with attributes:
+       *  word (str) is the lower case word
+       *  path is the list of (col, row) grid positions that spell it
+       *  score (int) is the Boggle score of the word
+    """
+
+    __slots__ = ['word', 'path', 'score']
+
+    def __init__(self, word, path, score):
+        self.word = word
+        self.path = path
+        self.score = score
+
+    def __repr__(self):
+        return "SolvedWord({}, {}, {})".format(self.word, self.path, self.score)
+
+
+def tileLetters(texts):
+    """Returns the list of letter indices (0 for "a") of each lower case
+    tile string in texts; blank or unknown tiles get [DEAD], an index that
+    never matches a trie edge
+    >>> tileLetters(["a", "qu", ""])
+    [[0], [16, 20], [27]]
+    """
+    return [[ord(ch) - 97 for ch in text]
+            if text and all('a' <= ch <= 'z' for ch in text) else [DEAD]
+            for text in texts]
+
+
+@lru_cache(maxsize=None)
+def neighborTable(rows, cols):
+    """Returns, for each cell of a rows x cols grid in row major order, a
+    tuple of (cell, bit) pairs for its adjacent cells, where bit is the
+    cell's bit in a visited mask.
+    >>> neighborTable(2, 2)[0]
+    ((1, 2), (2, 4), (3, 8))
+    """
+    table = []
+    for r in range(rows):
+        for c in range(cols):
+            table.append(tuple((rr * cols + cc, 1 << (rr * cols + cc))
+                               for rr in range(max(r - 1, 0), min(r + 2, rows))
+                               for cc in range(max(c - 1, 0), min(c + 2, cols))
+                               if (rr, cc) != (r, c)))
+    return tuple(table)
+
+
+class SolverEngine:
+    """Solves rows x cols boards against a BoggleLexicon.  Uses a
+    precomputed neighbor table for the grid size and tracks visited cells
+    in an integer bitmask.  Keeps running totals of boards solved and time
+    spent so callers can report throughput.
+    >>> lex = BoggleLexicon.fromWords(["art", "tar", "rat", "party"])
+    >>> engine = SolverEngine(2, 2, lex)
+    >>> engine.findWords(["P", "A", "R", "T"])
+    {'art': (1, 2, 3), 'rat': (2, 1, 3), 'tar': (3, 1, 2)}
+    >>> engine.boardsSolved
+    1
+    """
+
+    __slots__ = ['_rows', '_cols', '_lex', '_neighbors', '_positions',
+                 'boardsSolved', 'solveTime']
+
+    def __init__(self, rows, cols, lex):
+        self._rows = rows
+        self._cols = cols
+        self._lex = lex
+        self._neighbors = neighborTable(rows, cols)
+        self._positions = tuple((c, r) for r in range(rows) for c in range(cols))
+        self.boardsSolved = 0
+        self.solveTime = 0.0
+
+    @property
+    def rows(self):
+        return self._rows
+
+    @property
+    def cols(self):
+        return self._cols
+
+    @property
+    def lexicon(self):
+        """Returns the BoggleLexicon words are searched in"""
+        return self._lex
+
+    @property
+    def throughput(self):
+        """Returns the boards solved per second so far"""
+        if not self.solveTime:
+            return 0.0
+        return self.boardsSolved / self.solveTime
+
+    def findWords(self, tiles, stop=None):
+        """Given a row major list of tile strings, returns a dict mapping
+        each word on the board to the tuple of cells of one path spelling it.
+        If stop is given it is called with each new word found, and the
+        search ends early (returning the words found so far) as soon as it
+        returns True."""
+        start = perf_counter()
+        lex = self._lex
+        masks = lex.masks
+        firsts = self._lex.firsts
+        neighbors = self._neighbors
+        texts = [tile.lower() for tile in tiles]
+        letters = tileLetters(texts)
+        heads = [1 << idx[0] for idx in letters]   # mask bit of each tile's first letter
+        tails = [idx[1:] for idx in letters]        # remaining letters ("u" of "Qu")
+        found = {}
+        path = []
+
+        def visit(cell, node, word, used):
+            # node is the trie node reached after the tile on cell
+            path.append(cell)
+            mask = masks[node]
+            if mask & TERMINAL and len(word) >= MIN_LENGTH and word not in found:
+                found[word] = tuple(path)
+                if stop is not None and stop(word):
+                    raise _StopSearch
+            first = firsts[node]
+            for nxt, bit in neighbors[cell]:
+                # step into the neighbor only if its tile continues the prefix
+                head = heads[nxt]
+                if used & bit or not mask & head:
+                    continue
+                child = first + (mask & (head - 1)).bit_count()
+                for idx in tails[nxt]:
+                    childMask = masks[child]
+                    tail = 1 << idx
+                    if not childMask & tail:
+                        break
+                    child = firsts[child] + (childMask & (tail - 1)).bit_count()
+                else:
+                    visit(nxt, child, word + texts[nxt], used | bit)
+            path.pop()
+
+        try:
+            for cell in range(len(tiles)):
+                node = lex.step(ROOT, texts[cell]) if letters[cell][0] != DEAD else NO_NODE
+                if node >= 0:
+                    visit(cell, node, texts[cell], 1 << cell)
+        except _StopSearch:
+            pass
+
+        self.boardsSolved += 1
+        self.solveTime += perf_counter() - start
+        return found
+
+    def solve(self, tiles, rules=CLASSIC):
+        """Given a row major list of tile strings, returns the list of
+        SolvedWords on the board in alphabetical order, scored with the
+        ScoringRules rules"""
+        found = self.findWords(tiles)
+        positions = self._positions
+        return [SolvedWord(word, [positions[cell] for cell in found[word]],
+                           rules.scoreWord(word))
+                for word in sorted(found)]
+
+
+def solve(board, lex, rules=CLASSIC):
+    """Given a BoggleBoard or BoggleGrid board (or any object with rows, cols
+    and getLetter((col, row))) and a BoggleLexicon lex, returns the list of
+    SolvedWords on the board in alphabetical order, scored with rules"""
+    tiles = getattr(board, 'tiles', None)
+    if tiles is None:
+        tiles = [board.getLetter((c, r))
+                 for r in range(board.rows) for c in range(board.cols)]
+    return solveTiles(tiles, board.rows, board.cols, lex, rules)
+
+
+def solveTiles(tiles, rows, cols, lex, rules=CLASSIC):
+    """Given a row major list of tile strings for a rows x cols grid and a
+    BoggleLexicon lex, returns the list of SolvedWords in alphabetical order,
+    scored with the ScoringRules rules.
+    >>> lex = BoggleLexicon.fromWords(["art", "tar", "rat", "party", "quit"])
+    >>> [(s.word, s.path) for s in solveTiles(["P", "A", "R", "T"], 2, 2, lex)]
+    [('art', [(1, 0), (0, 1), (1, 1)]), ('rat', [(0, 1), (1, 0), (1, 1)]), ('tar', [(1, 1), (1, 0), (0, 1)])]
+    >>> [s.word for s in solveTiles(["Qu", "I", "", "T"], 2, 2, lex)]
+    ['quit']
+    """
+    return SolverEngine(rows, cols, lex).solve(tiles, rules)
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
+
+    lex = BoggleLexicon.fromFile()
+    tiles = ["S", "E", "R", "S", "P", "A", "T", "G",
+             "L", "I", "N", "E", "S", "E", "R", "S"]
+    engine = SolverEngine(4, 4, lex)
+    words = engine.solve(tiles)
+    print("{} words, {} points".format(len(words), sum(s.score for s in words)))
+    for i in range(200):
+        engine.findWords(tiles)
+    print("{:.0f} boards per second".format(engine.throughput))
@@ -2,25 +2,38 @@
 """Implements the functionality of a building and storing words
 in the game of Boggle."""
 
-# import boggle letter
-from boggleletter import BoggleLetter
+from bogglelexicon import ROOT, NO_NODE, TERMINAL
 
 class BoggleWords:
     """Implements the functionality of a building and storing words
     in the game of Boggle.
-    Uses BoggleLetter class.  Has the following attributes:
+    Uses BoggleLetter class (or any object with a letter attribute), and
+    imports no graphics itself.  Has the following attributes:
     -  _currWord stores current word being constructed and is a list of BoggleLetters
-    -  _wordSet is a set of already constructed words.
-    -  _allWords is a newline separated strings of constructed words
+    -  _wordStr caches the letters of _currWord joined together
+    -  _wordSet is an insertion ordered set (the keys of a dict) of already
+       constructed words, so adding or checking a word costs O(1)
+    -  _allWords is a newline separated strings of constructed words,
+       extended lazily from _pending (words added since it was last read)
+    -  _lexicon is an optional BoggleLexicon used to check the current word
+    -  _nodes is the list of lexicon nodes reached after each letter of
+       _currWord, so prefix and word checks cost O(1) per click
     """
 
-    __slots__ = ['_currWord', '_wordSet', '_allWords']
+    __slots__ = ['_currWord', '_wordStr', '_wordSet', '_allWords', '_pending',
+                 '_lexicon', '_nodes']
 
-    def __init__(self, currWord=[], wordSet=set(), allWords=""):
+    def __init__(self, currWord=None, wordSet=None, allWords="", lexicon=None):
         """Initializes attributes"""
-        self._currWord = currWord # currWord is a list of BoggleLetters
-        self._wordSet = wordSet
+        self._currWord = [] # currWord is a list of BoggleLetters
+        self._wordStr = ''
+        self._wordSet = dict.fromkeys(wordSet or ())
         self._allWords = allWords
+        self._pending = []
+        self._lexicon = lexicon
+        self._nodes = []
+        for boggleLtr in currWord or ():
+            self.addLetter(boggleLtr)
 
     # getter methods for this class
     @property
@@ -31,23 +44,79 @@ class BoggleWords:
 
     @property
     def allWords(self):
-        """Returns the _allWords attribute of calling object
+        """Returns the _allWords attribute of calling object, after joining
+        on any words added since it was last read
+        >>> from types import SimpleNamespace as Tile
+        >>> bw = BoggleWords([], ["PARTY"], "PARTY")
+        >>> bw.addLetter(Tile(letter="A")); bw.addLetter(Tile(letter="R"))
+        >>> bw.addLetter(Tile(letter="T")); bw.addWord(), bw.addWord()
+        (True, False)
+        >>> bw.allWords
+        'PARTY\\nART'
         """
+        if self._pending:
+            self._allWords += ''.join('\n' + word for word in self._pending)
+            self._pending = []
         return self._allWords
 
+    @property
+    def words(self):
+        """Returns a list of the constructed words in the order they were added"""
+        return list(self._wordSet)
+
     @property
     def wordStr(self):
         """Returns a string that is the boggle letters in currentWord joined together.
-        >>> BoggleWords([BoggleLetter(1, 1, "A"), BoggleLetter(0, 0, "R"), \
-BoggleLetter(3, 4, "T")]).wordStr
+        >>> from types import SimpleNamespace as Tile     # any object with a letter
+        >>> BoggleWords([Tile(letter="A"), Tile(letter="R"), Tile(letter="T")]).wordStr
         'ART'
         """
-        letters = '' # initialize
+        return self._wordStr
 
-        for boggleLtr in self.currWord: # get BoggleLetter objects
-            letters += boggleLtr.letter # add BoggleLetter letters
+    @property
+    def isPrefix(self):
+        """Returns True if some word in the lexicon starts with the current
+        word (always True without a lexicon).
+        >>> from types import SimpleNamespace as Tile
+        >>> from bogglelexicon import BoggleLexicon
+        >>> bw = BoggleWords([], set(), "", BoggleLexicon.fromWords(["art", "quit"]))
+        >>> bw.addLetter(Tile(letter="Qu")); bw.addLetter(Tile(letter="I"))
+        >>> bw.isPrefix, bw.isWord
+        (True, False)
+        >>> bw.addLetter(Tile(letter="T")); bw.isWord
+        True
+        >>> bw.addLetter(Tile(letter="S")); bw.isPrefix
+        False
+        """
+        return not self._nodes or self._nodes[-1] != NO_NODE
 
-        return letters
+    @property
+    def isWord(self):
+        """Returns True if the current word is in the lexicon
+        (always False without a lexicon)"""
+        if not self._nodes or self._nodes[-1] == NO_NODE:
+            return False
+        return bool(self._lexicon.masks[self._nodes[-1]] & TERMINAL)
+
+    def _advance(self, nextLetter):
+        """Moves the lexicon cursor one tile down for nextLetter.  A blank
+        tile (Super Big Boggle) spells nothing, so no word passes through
+        it, as in the solver.
+        >>> from types import SimpleNamespace as Tile
+        >>> from bogglelexicon import BoggleLexicon
+        >>> bw = BoggleWords([], set(), "", BoggleLexicon.fromWords(["cat"]))
+        >>> for tile in ["C", "", "A", "T"]:
+        ...     bw.addLetter(Tile(letter=tile))
+        >>> bw.wordStr, bw.isPrefix, bw.isWord
+        ('CAT', False, False)
+        """
+        if self._lexicon is None:
+            return
+        node = self._nodes[-1] if self._nodes else ROOT
+        if node != NO_NODE:
+            letter = nextLetter.letter
+            node = self._lexicon.step(node, letter) if letter else NO_NODE
+        self._nodes.append(node)
 
     # following two methods are helpful in adding letters/words during play
     def addLetter(self, nextLetter):
@@ -55,37 +124,49 @@ BoggleLetter(3, 4, "T")]).wordStr
         to _currWord attribute.
         """
         self.currWord.append(nextLetter) # append next BoggleLetter to currWord list
+        self._wordStr += nextLetter.letter
+        self._advance(nextLetter)        # move the lexicon cursor along
 
     def addWord(self):
         """If currWord being built is not already a word that was added to _wordSet
-        then this method adds it to _wordSet, and concatenates it to _allWords
-        (with a '\n' as separator)
+        then this method adds it to _wordSet, and queues it to be concatenated
+        to _allWords (with a '\n' as separator).  Returns True if the word
+        was new.
         """
-        if self.wordStr not in self._allWords:
-            self._wordSet.add(self.wordStr)         # add word to wordSet
-            self._allWords += ("\n" + self.wordStr) # concatenate word to allWords
+        word = self._wordStr
+        if word in self._wordSet:
+            return False
+        self._wordSet[word] = None  # add word to wordSet
+        self._pending.append(word)  # concatenate to allWords when next read
+        return True
 
     # following two methods are useful for reset during play
     def clearCurrentWord(self):
         """Resets currWord to be empty"""
         self._currWord = []
+        self._wordStr = ''
+        self._nodes = []
 
     def reset(self):
         """Resets all attributes to empty/initial state."""
         self._currWord = []
-        self._wordSet = set()
+        self._wordStr = ''
+        self._wordSet = {}
         self._allWords = ""
+        self._pending = []
+        self._nodes = []
 
     def __str__(self):
         """Print representation of BoggleWords"""
-        return "Current: {}, Past: {}".format(self.wordStr, self._wordSet)
+        return "Current: {}, Past: {}".format(self.wordStr, set(self._wordSet))
 
     def __repr__(self):
         """String representation of BoggleWords"""
-        return "BoggleWords({}, {}, {})".format(self.currWord, self._wordSet, self.allWords)
+        return "BoggleWords({}, {}, {})".format(self.currWord, set(self._wordSet), self.allWords)
 
 
 if __name__ == "__main__":
+    from boggleletter import BoggleLetter
     from doctest import testmod
     testmod()
 
@@ -0,0 +1,119 @@
+# Cube set lexicons
+"""Prunes a word list down to the words a cube set can actually spell.
+A word can only appear on a board if it splits into faces (one letter,
+or "Qu" and the other two-letter faces) that can each be shown by a
+different cube.  Words needing a face no cube has, or more copies of a
+face than there are cubes showing it, are dropped, so the solver never
+walks the trie branches that lead only to them."""
+
+import hashlib
+from bogglelexicon import BoggleLexicon
+
+
+def cubesKey(cubes):
+    """Returns a short hex digest identifying the cube set cubes (a list of
+    lists of face strings); reordering cubes or faces does not change it
+    >>> cubesKey([["A", "B"], ["C", "D"]]) == cubesKey([["D", "C"], ["B", "A"]])
+    True
+    """
+    text = '|'.join(sorted(','.join(sorted(face.lower() for face in cube))
+                           for cube in cubes))
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+class CubeMatcher:
+    """Decides which words a cube set can spell, with attributes:
+       *  _cubes is the number of cubes
+       *  _holders maps each lower case face to the tuple of indices of
+          the cubes carrying it
+       *  _longest (int) is the length of the longest face
+    >>> from bogglegrid import CUBES
+    >>> matcher = CubeMatcher(CUBES)
+    >>> matcher.formable("quiet"), matcher.formable("qat"), matcher.formable("eerie")
+    (True, False, True)
+    >>> matcher.formable("zizz")        # one cube has a Z
+    False
+    """
+
+    __slots__ = ['_cubes', '_holders', '_longest']
+
+    def __init__(self, cubes):
+        holders = {}
+        for index, cube in enumerate(cubes):
+            for face in set(face.lower() for face in cube):
+                if face:
+                    holders.setdefault(face, []).append(index)
+        self._cubes = len(cubes)
+        self._holders = {face: tuple(indices) for face, indices in holders.items()}
+        self._longest = max(len(face) for face in self._holders)
+
+    def splits(self, word, start=0):
+        """Generates every way to split word[start:] into faces, as lists
+        of face strings"""
+        if start == len(word):
+            yield []
+            return
+        for length in range(1, self._longest + 1):
+            face = word[start:start + length]
+            if len(face) == length and face in self._holders:
+                for rest in self.splits(word, start + length):
+                    yield [face] + rest
+
+    def assignable(self, faces):
+        """Returns True if each face in the list faces can be shown by a
+        different cube (a bipartite matching of faces to cubes)"""
+        if len(faces) > self._cubes:
+            return False
+        holders = self._holders
+        owner = {}      # cube index -> position in faces it is showing
+
+        def place(pos, seen):
+            for cube in holders[faces[pos]]:
+                if cube in seen:
+                    continue
+                seen.add(cube)
+                if cube not in owner or place(owner[cube], seen):
+                    owner[cube] = pos
+                    return True
+            return False
+
+        return all(place(pos, set()) for pos in range(len(faces)))
+
+    def formable(self, word):
+        """Returns True if some board from the cube set could spell word"""
+        word = word.lower()
+        return any(self.assignable(faces) for faces in self.splits(word))
+
+
+def formableWords(words, cubes):
+    """Returns the list of words (an iterable of str) that the cube set
+    cubes can spell, in their original order
+    >>> from bogglegrid import CUBES
+    >>> formableWords(["quit", "qat", "jazz", "party"], CUBES)
+    ['quit', 'party']
+    """
+    matcher = CubeMatcher(cubes)
+    return [word for word in words if matcher.formable(word)]
+
+
+def pruneLexicon(source, cubes):
+    """Returns a BoggleLexicon of the words in the file source that the
+    cube set cubes can spell"""
+    with open(source) as f:
+        words = [line.strip().lower() for line in f]
+    return BoggleLexicon.fromWords(formableWords((word for word in words if word), cubes))
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
+
+    import time
+    from bogglegrid import CUBE_SETS
+    full = BoggleLexicon.fromFile()
+    for size, cubes in sorted(CUBE_SETS.items()):
+        start = time.perf_counter()
+        pruned = pruneLexicon('bogwords.txt', cubes)
+        print("{}x{}: {} of {} words, {} of {} nodes ({:.0f} ms)".format(
+            size[0], size[1], len(pruned), len(full), pruned.nodeCount,
+            full.nodeCount, (time.perf_counter() - start) * 1000))
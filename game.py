@@ -7,17 +7,20 @@ from random import randint
 from boggleboard import BoggleBoard
 from boggleletter import BoggleLetter
 from bogglewords import BoggleWords
+from lexiconcache import loadLexicon
+from bogglesolver import SolverEngine
+from scoring import rulesFor
+import argparse
+import sys
 import time
 
 # This helper function creates the Boggle lexicon.
 def lexicon(filename='bogwords.txt'):
     """Reads words (one per line) from filename (by default 'bogwords.txt')
-    and returns a set of all words"""
-    result = set()
-    with open(filename) as f:
-        for lines in f:
-            result.add(lines.strip())
-    return result
+    and returns a BoggleLexicon supporting word and prefix queries.
+    The lexicon is memory mapped from a compiled cache next to filename,
+    which is rebuilt whenever filename changes."""
+    return loadLexicon(filename)
 
 def setup(win, board):
     """Given a graphical window and BoggleBoard board,
@@ -31,142 +34,205 @@ def resetLower(board):
     along with the lower text area"""
     board.clearLetters()        # clear letters
     board.clearLowerText()      # clear lower text
+    board.setLowerTextColor("black")
 
 def update(board, bWords):
     """Updates the state of the BoggleBoard board after a valid word has been found
     and added to BoggleWords bWords; updates right text area, clears lower
     text area, and resets BoggleLetters to unclicked state."""
-    board.setTextArea(bWords._allWords) # set right text to all valid words
+    board.setTextArea(bWords.allWords)  # set right text to all valid words
     board.clearLowerText()              # clear lower text
+    board.setLowerTextColor("black")    # no dead prefix to flag
     board.clearLetters()                # unlick all boggle letters
     bWords.clearCurrentWord()           # reset current word
 
-def play(win, board):
-    """Given a graphical window and a BoggleBoard board, implements the logic
-    for playing the game"""
-
-    # initialize flag and boggle words
-    exitFlag = False
-
-    # populate the lexicon
-    validWords = lexicon()
-
-    # initialize an empty BoggleWords object
-    bWord = BoggleWords()
-
-    # game directions for user
-    board.setStringToUpperText('Click to Start Timer')
-
-    # wait to get mouse click
-    pt = win.getMouse()
-
-    # intialize time
-    seconds = 31
-    start = time.time()
-
-    # intialize score
-    score = 0
-
-    while not exitFlag:
-
-        pt = None
-
-        # timer
-        currTime = time.time()
-        diff = currTime - start
-        timeLeft = int(seconds - diff)
-        timer = 'Countdown: {} Current Score: {}'.format(str(timeLeft), score)
-        board.setStringToUpperText(timer)
-        time.sleep(.1)
-
-        # find (col, row) coord of mouse click
-        pt = win.checkMouse()
-
-        # if timer runs out
-        while timeLeft <= 0:
-            numWords = len(bWord._wordSet) # number of words found by user
-            board.setStringToUpperText('Times Up! Words Found: {} Final Score: {}'.format(numWords, score))
-            board.clearLowerText()
-
-            # wait to get mouse click
-            pt = win.getMouse()
-
-            if pt:
-                if board.inExit(pt): # exit
-                    exitFlag = True
-                    break
-                elif board.inReset(pt): # reset board and timer
-                    bWord.reset()
-                    board.reset()
-                    start = time.time()
-                    score = 0
-                    pt = None
-                    break
-
-        if not pt:
-            continue
-
-        # get mouse location
-        position = board.getPosition((pt.getX(), pt.getY()))
+class BoggleGame:
+    """Runs one game of Boggle on a graphical window from Tk callbacks:
+    clicks arrive through the window's mouse handler and the countdown is
+    a tick scheduled with after() against a monotonic clock, so nothing
+    polls while the player is idle.  Has the following attributes:
+    -  _win, _board are the GraphWin and BoggleBoard being played on
+    -  _bWord is the BoggleWords state of the current round
+    -  _engine is a SolverEngine used to find the board's best score
+    -  _rules are the ScoringRules for the board's size
+    -  _score (int) is the score of the current round
+    -  _start (float) is the monotonic time the round started
+    -  _phase (str) is "waiting" before the first click, "playing" while
+       the timer runs and "over" once time is up
+    -  _tickId is the id of the scheduled timer tick, or None
+    -  _shown (str) is the last status shown above the grid
+    """
+
+    __slots__ = ['_win', '_board', '_bWord', '_engine', '_rules', '_score', '_start',
+                 '_phase', '_tickId', '_shown']
+
+    SECONDS = 31    # length of a round, counted down from SECONDS - 1
+
+    def __init__(self, win, board, validWords):
+        self._win = win
+        self._board = board
+        self._bWord = BoggleWords([], set(), "", validWords)
+        self._engine = SolverEngine(board.rows, board.cols, validWords)
+        self._rules = rulesFor(board.rows, board.cols)
+        self._score = 0
+        self._start = 0.0
+        self._phase = "waiting"
+        self._tickId = None
+        self._shown = None
+
+    def start(self):
+        """Shows the game directions and starts listening for clicks"""
+        self._board.setStringToUpperText('Click to Start Timer')
+        self._win.setMouseHandler(self.onClick)
+        # closing the window must also end the event loop, which runs on
+        # the hidden root window rather than the game window
+        self._win.master.protocol("WM_DELETE_WINDOW", self.quit)
+
+    def newRound(self):
+        """Clears words and score and starts the countdown"""
+        self._bWord.reset()
+        self._score = 0
+        self._start = time.monotonic()
+        self._phase = "playing"
+        self._shown = None
+        self.tick()
+
+    def timeLeft(self):
+        """Returns the seconds left in the round (may be fractional)"""
+        return self.SECONDS - (time.monotonic() - self._start)
+
+    def tick(self):
+        """Updates the countdown and schedules the next tick for when the
+        displayed second changes"""
+        self._tickId = None
+        left = self.timeLeft()
+        if int(left) <= 0:
+            self.finish()
+            return
+        self.showStatus()
+        delay = int((left - int(left)) * 1000) + 1
+        self._tickId = self._win.after(delay, self.tick)
+
+    def showStatus(self):
+        """Shows the countdown and score above the grid if they changed"""
+        timer = 'Countdown: {} Current Score: {}'.format(int(self.timeLeft()), self._score)
+        if timer != self._shown:
+            self._board.setStringToUpperText(timer)
+            self._shown = timer
+
+    def finish(self):
+        """Ends the round and shows the final score"""
+        self._phase = "over"
+        numWords = len(self._bWord.words) # number of words found by user
+        maxScore = self._rules.maxScore(self._engine, self._board.tiles) # best possible score
+        percent = 100 * self._score / maxScore if maxScore else 0
+        self._board.setStringToUpperText('Times Up! Words Found: {} Final Score: {} of {} ({:.0f}%)'.format(
+            numWords, self._score, maxScore, percent))
+        resetLower(self._board)
+        self._bWord.clearCurrentWord()
+
+    def quit(self):
+        """Stops the timer and closes the window"""
+        if self._tickId is not None:
+            self._win.after_cancel(self._tickId)
+            self._tickId = None
+        self._win.quit()
+        self._win.close()
+
+    def reset(self):
+        """Shakes a new board and starts a new round"""
+        if self._tickId is not None:
+            self._win.after_cancel(self._tickId)
+        self._board.reset()
+        self.newRound()
+
+    def onClick(self, pt):
+        """Mouse handler: given the Point pt that was clicked, updates the game"""
+        board = self._board
+        if self._phase == "waiting":
+            self.newRound()
+            return
 
         # step 1: check for exit button and exit
         if board.inExit(pt):
-            exitFlag = True
+            self.quit()
+            return
 
         # step 2: check for reset button and reset
         if board.inReset(pt):
-            bWord.reset()
-            board.reset()
-            start = time.time()
-            score = 0
+            self.reset()
+            return
 
         # step 3: check if click is on a cell in the grid
-        if board.inGrid(pt):
-
-            # get BoggleLetter at that position and change color to blue
-            bLetter = board.getLetterObj(position)
-            bLetter.click()
-
-            # if starting a new word, add letter and display it on lower text of board
-            if bWord.currWord == []:
-                bWord.addLetter(bLetter)
-                board.setStringToLowerText(bLetter.letter)
-
-            # if adding letter to existing word, check for adjacency, update state
-            elif bLetter.isAdjacent(bWord.currWord[-1]):
-                bWord.addLetter(bLetter)
-                board.addStringToLowerText(bLetter.letter)
-
-            # if clicked on same letter as last time, end word, check for validity
-            elif bLetter == bWord.currWord[-1]:
-                if bWord.wordStr.lower() in validWords: # if word is valid update bWords
-                    bWord.addWord()
-
-                    wordLen = len(bWord.wordStr) # length of valid word
-
-                    # update corresponding boggle score
-                    if wordLen <= 4:
-                        score = score + 1
-                    elif wordLen == 5:
-                        score = score + 2
-                    elif wordLen == 6:
-                        score = score + 3
-                    elif wordLen == 7:
-                        score = score + 5
-                    else:
-                        score = score + 11
-
-                    # update board
-                    update(board, bWord)
-
-                update(board, bWord)
-
-            # if clicked on some other letter, cancel word, reset stat
-            else:
-                resetLower(board)
+        if self._phase == "playing" and board.inGrid(pt):
+            self.clickGrid(board.getPosition((pt.getX(), pt.getY())))
+
+    def clickGrid(self, position):
+        """Handles a click on the grid cell at position, a (col, row) tuple"""
+        board = self._board
+        bWord = self._bWord
+
+        # get BoggleLetter at that position and change color to blue
+        bLetter = board.getLetterObj(position)
+        bLetter.click()
+
+        # if starting a new word, add letter and display it on lower text of board
+        if bWord.currWord == []:
+            bWord.addLetter(bLetter)
+            board.setStringToLowerText(bLetter.letter)
+            board.setLowerTextColor("black" if bWord.isPrefix else "red")
+
+        # if adding letter to existing word, check for adjacency, update state
+        elif bLetter.isAdjacent(bWord.currWord[-1]):
+            bWord.addLetter(bLetter)
+            board.addStringToLowerText(bLetter.letter)
+            board.setLowerTextColor("black" if bWord.isPrefix else "red")
+
+        # if clicked on same letter as last time, end word, check for validity
+        elif bLetter == bWord.currWord[-1]:
+            # if word is valid and not found before, update score
+            if bWord.isWord and bWord.addWord():
+                self._score += self._rules.scoreWord(bWord.wordStr)
+                self.showStatus()
+            update(board, bWord)
+
+        # if clicked on some other letter, cancel word, reset stat
+        else:
+            resetLower(board)
+            bWord.clearCurrentWord()
+
+def play(win, board):
+    """Given a graphical window and a BoggleBoard board, implements the logic
+    for playing the game.  Runs the Tk event loop until the player exits."""
+    game = BoggleGame(win, board, lexicon())
+    game.start()
+    win.mainloop()
 
 if __name__ == '__main__':
-    win = GraphWin("Boggle", 400, 400)
-    board = BoggleBoard()
+    parser = argparse.ArgumentParser(description="Plays a game of Boggle")
+    parser.add_argument('size', nargs='?', type=int, default=4,
+                        help='board size: 4 (default), 5 (Big) or 6 (Super Big)')
+    parser.add_argument('--profile', action='store_true',
+                        help='time the game and print a summary when it ends')
+    parser.add_argument('--stacks', metavar='FILE',
+                        help='also sample stacks and write them to FILE in folded '
+                             '(flamegraph) format')
+    args = parser.parse_args()
+
+    profile = args.profile or args.stacks
+    if profile:
+        import instrument
+        instrument.enable(sample=bool(args.stacks))
+
+    # draw once per frame: the board batches changes and Tk flushes them
+    win = GraphWin("Boggle", 400, 400, autoflush=False)
+    board = BoggleBoard(args.size, args.size)
+    board.setBatched()
     setup(win, board)
     play(win, board)
+
+    if profile:
+        instrument.disable()
+        print(instrument.summary(), file=sys.stderr)
+        if args.stacks:
+            instrument.writeStacks(args.stacks)
@@ -0,0 +1,250 @@
+# script gameserver.py
+"""Hosts many Boggle games at once over local TCP.  Every session plays
+its own board against its own clock, while all sessions share one
+memory mapped lexicon and one solver (with its solve cache) per board size.
+
+The protocol is one command per line, answered by one line:
+
+    NEW [size]      start a round on a new size x size board (default 4)
+                    -> BOARD <size> <seconds> <tiles, comma separated>
+    WORD <word>     submit a word
+                    -> OK <points> <score> | DUP | SHORT | NOTWORD |
+                       NOTONBOARD | OVER <score> | ERR <reason>
+    STATUS          -> STATUS <seconds left> <score> <words found> <words on board>
+    WORDS           -> WORDS <words found, comma separated>
+    QUIT            -> BYE, then the server closes the connection
+
+    python gameserver.py --port 8765
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from bogglegrid import BoggleGrid, CUBE_SETS
+from bogglesolver import SolverEngine
+from lexiconcache import loadLexicon
+from myrandom import BoggleRandom
+from scoring import rulesFor
+from solvecache import SolveCache
+
+
+class GameSession:
+    """One player's game on the server, with attributes:
+       *  _server is the GameServer the session belongs to
+       *  _size (int) is the number of rows and columns of the board
+       *  _tiles is the row major list of tile strings, or None before NEW
+       *  _solution is a dict mapping each scoring word on the board (of at
+          least the rules' minimum length) to its cells
+       *  _found is an insertion ordered set (the keys of a dict) of the
+          words found this round, like BoggleWords
+       *  _rules are the ScoringRules for the board's size
+       *  _score (int) is the score of the current round
+       *  _end (float) is the monotonic time the round ends
+    >>> server = GameServer(seconds=30, seed=1)
+    >>> session = GameSession(server)
+    >>> session.handle("WORD art")
+    'ERR no round, send NEW'
+    >>> session.handle("NEW").split()[:3]
+    ['BOARD', '4', '30']
+    >>> word = sorted(session.solution)[0]
+    >>> session.handle("WORD " + word).startswith("OK"), session.handle("WORD " + word)
+    (True, 'DUP')
+    >>> session.handle("WORD zzzq"), session.handle("WORD at")
+    ('NOTWORD', 'SHORT')
+    """
+
+    __slots__ = ['_server', '_size', '_tiles', '_solution', '_found', '_rules',
+                 '_score', '_end']
+
+    def __init__(self, server):
+        self._server = server
+        self._size = 4
+        self._tiles = None
+        self._solution = {}
+        self._found = {}
+        self._rules = rulesFor(4, 4)
+        self._score = 0
+        self._end = 0.0
+
+    @property
+    def tiles(self):
+        return self._tiles
+
+    @property
+    def solution(self):
+        """Returns the dict of scoring words on the board mapped to their cells"""
+        return self._solution
+
+    @property
+    def score(self):
+        return self._score
+
+    def timeLeft(self):
+        """Returns the seconds left in the round (0 once it is over)"""
+        return max(self._end - time.monotonic(), 0.0)
+
+    def handle(self, line):
+        """Given one command line (str), updates the session and returns the
+        reply line (without its newline)"""
+        command, _, arg = line.strip().partition(' ')
+        command = command.upper()
+        if command == 'WORD':
+            return self.word(arg.strip())
+        if command == 'NEW':
+            return self.newRound(arg.strip())
+        if command == 'STATUS':
+            return 'STATUS {:.1f} {} {} {}'.format(self.timeLeft(), self._score,
+                                                   len(self._found), len(self._solution))
+        if command == 'WORDS':
+            return 'WORDS ' + ','.join(self._found)
+        if command == 'QUIT':
+            return 'BYE'
+        return 'ERR unknown command'
+
+    def newRound(self, arg=''):
+        """Shakes a new board (arg is its size, default 4) and starts the clock"""
+        try:
+            size = int(arg) if arg else 4
+        except ValueError:
+            return 'ERR size must be a number'
+        if (size, size) not in CUBE_SETS:
+            return 'ERR no cube set for size {}'.format(size)
+        server = self._server
+        self._size = size
+        self._tiles = server.shake(size)
+        self._rules = rulesFor(size, size)
+        minLength = self._rules.minLength
+        self._solution = {word: cells for word, cells
+                          in server.solver(size).findWords(self._tiles).items()
+                          if len(word) >= minLength}
+        self._found = {}
+        self._score = 0
+        self._end = time.monotonic() + server.seconds
+        return 'BOARD {} {} {}'.format(size, server.seconds, ','.join(self._tiles))
+
+    def word(self, word):
+        """Checks a submitted word and scores it if it is new and on the board"""
+        if self._tiles is None:
+            return 'ERR no round, send NEW'
+        if time.monotonic() >= self._end:
+            return 'OVER {}'.format(self._score)
+        word = word.lower()
+        if word in self._found:
+            return 'DUP'
+        if len(word) < self._rules.minLength:
+            return 'SHORT'
+        if word not in self._solution:
+            return 'NOTONBOARD' if word in self._server.lexicon else 'NOTWORD'
+        points = self._rules.scoreWord(word)
+        self._found[word] = None
+        self._score += points
+        return 'OK {} {}'.format(points, self._score)
+
+
+class GameServer:
+    """Serves GameSessions over TCP, with attributes:
+       *  _lexicon is the BoggleLexicon shared by every session
+       *  _solvers maps a board size to the SolveCache shared by sessions
+          playing that size
+       *  _rng is the BoggleRandom boards are shaken with
+       *  _grids maps a board size to the BoggleGrid boards are shaken on
+       *  _seconds (int) is the length of a round
+       *  sessions (int) is the number of connected sessions
+       *  requests (int) and handleTime (float) total the commands handled
+          and the seconds spent handling them
+    """
+
+    __slots__ = ['_lexicon', '_solvers', '_rng', '_grids', '_seconds',
+                 'sessions', 'requests', 'handleTime']
+
+    def __init__(self, lexicon=None, seconds=180, seed=None):
+        self._lexicon = lexicon if lexicon is not None else loadLexicon()
+        self._solvers = {}
+        self._rng = BoggleRandom(seed)
+        self._grids = {}
+        self._seconds = seconds
+        self.sessions = 0
+        self.requests = 0
+        self.handleTime = 0.0
+
+    @property
+    def lexicon(self):
+        return self._lexicon
+
+    @property
+    def seconds(self):
+        return self._seconds
+
+    def solver(self, size):
+        """Returns the SolveCache for size x size boards, creating it on first use"""
+        solver = self._solvers.get(size)
+        if solver is None:
+            solver = SolveCache(SolverEngine(size, size, self._lexicon))
+            self._solvers[size] = solver
+        return solver
+
+    def shake(self, size):
+        """Returns the row major tiles of a newly shaken size x size board"""
+        grid = self._grids.get(size)
+        if grid is None:
+            grid = self._grids[size] = BoggleGrid(size, size)
+        grid.shakeCubes(rng=self._rng)
+        return list(grid.tiles)
+
+    async def serve(self, reader, writer):
+        """Runs one session for a connected client until it quits or disconnects"""
+        session = GameSession(self)
+        self.sessions += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                start = time.perf_counter()
+                reply = session.handle(line.decode('ascii', 'replace'))
+                self.handleTime += time.perf_counter() - start
+                self.requests += 1
+                writer.write(reply.encode('ascii') + b'\n')
+                if reply == 'BYE':
+                    break
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=8765):
+        """Starts listening and returns the asyncio Server (port 0 picks a
+        free port)"""
+        return await asyncio.start_server(self.serve, host, port, backlog=4096)
+
+
+async def serveForever(server, host, port):
+    listener = await server.start(host, port)
+    address = listener.sockets[0].getsockname()
+    print('serving Boggle on {}:{}'.format(address[0], address[1]), file=sys.stderr)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on')
+    parser.add_argument('--port', type=int, default=8765, help='port to listen on')
+    parser.add_argument('--seconds', type=int, default=180, help='length of a round')
+    parser.add_argument('--lexicon', default='bogwords.txt', help='word list')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='seed for a reproducible sequence of boards')
+    args = parser.parse_args(argv)
+
+    server = GameServer(loadLexicon(args.lexicon), args.seconds, args.seed)
+    try:
+        asyncio.run(serveForever(server, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+# Tournament grading
+"""Grades many players' word lists for one board at once, for tournament
+play.  The board is solved once; each submission is then checked against
+that solution with one set intersection, and only the words it rejects
+are looked up in the lexicon, to tell words that are not words at all
+from words that are simply not on the board."""
+
+from time import perf_counter
+from scoring import rulesFor
+
+
+class Grade:
+    """One graded submission, with attributes:
+       *  words is the sorted list of accepted words: on the board, long
+          enough to score, and counted once however often submitted
+       *  score (int) is the total points of the accepted words
+       *  duplicates is the sorted list of words submitted more than once
+       *  short is the sorted list of words too short to score
+       *  notWords is the sorted list of words not in the lexicon
+       *  notOnBoard is the sorted list of words in the lexicon that are
+          not on the board
+    The lists hold lower case words, as the game stores them.
+    """
+
+    __slots__ = ['words', 'score', 'duplicates', 'short', 'notWords', 'notOnBoard']
+
+    def __init__(self, words, score, duplicates, short, notWords, notOnBoard):
+        self.words = words
+        self.score = score
+        self.duplicates = duplicates
+        self.short = short
+        self.notWords = notWords
+        self.notOnBoard = notOnBoard
+
+    @property
+    def rejected(self):
+        """Returns the number of distinct words that did not score"""
+        return len(self.short) + len(self.notWords) + len(self.notOnBoard)
+
+    def __repr__(self):
+        return "Grade({} words, {} points, {} rejected, {} duplicates)".format(
+            len(self.words), self.score, self.rejected, len(self.duplicates))
+
+
+class Grader:
+    """Grades submissions for one board, with attributes:
+       *  _tiles is the row major list of tile strings
+       *  _rules are the ScoringRules submissions are scored with
+       *  _lexicon is the BoggleLexicon rejected words are looked up in
+       *  _points is a dict mapping each scoring word on the board to its
+          points, and _solution the frozenset of those words
+       *  _maxScore (int) is the total points of the solution
+       *  _verdicts caches, for each rejected word seen so far, the name of
+          the Grade list it belongs in ("short", "notWords" or
+          "notOnBoard"), since many players make the same mistakes
+       *  graded (int) and gradeTime (float) total the submissions graded
+          and the seconds spent grading them
+    >>> from bogglelexicon import BoggleLexicon
+    >>> from bogglesolver import SolverEngine
+    >>> lex = BoggleLexicon.fromWords(["art", "tar", "rat", "part", "trap", "pear"])
+    >>> grader = Grader(SolverEngine(2, 2, lex), ["P", "A", "R", "T"])
+    >>> grader.maxScore
+    5
+    >>> grade = grader.grade(["Part", "tar", "tar", "at", "xyzzy", "pear", " rat "])
+    >>> grade
+    Grade(3 words, 3 points, 3 rejected, 1 duplicates)
+    >>> grade.words, grade.duplicates, grade.short, grade.notWords, grade.notOnBoard
+    (['part', 'rat', 'tar'], ['tar'], ['at'], ['xyzzy'], ['pear'])
+    >>> [g.score for g in grader.gradeAll([["trap", "art"], []])]
+    [2, 0]
+    >>> grader.gradeAll({"ann": ["rat"], "bob": ["tarp"]})["bob"].notWords
+    ['tarp']
+    """
+
+    __slots__ = ['_tiles', '_rules', '_lexicon', '_points', '_solution', '_maxScore',
+                 '_verdicts', 'graded', 'gradeTime']
+
+    def __init__(self, solver, tiles, lexicon=None, rules=None):
+        engine = getattr(solver, 'engine', solver)   # a SolveCache or a SolverEngine
+        self._tiles = list(tiles)
+        self._rules = rules if rules is not None else rulesFor(engine.rows, engine.cols)
+        self._lexicon = lexicon if lexicon is not None else engine.lexicon
+        scoreWord = self._rules.scoreWord
+        minLength = self._rules.minLength
+        self._points = {word: scoreWord(word) for word in solver.findWords(self._tiles)
+                        if len(word) >= minLength}
+        self._solution = frozenset(self._points)
+        self._maxScore = sum(self._points.values())
+        self._verdicts = {}
+        self.graded = 0
+        self.gradeTime = 0.0
+
+    # getter methods for attributes
+    @property
+    def tiles(self):
+        return list(self._tiles)
+
+    @property
+    def rules(self):
+        return self._rules
+
+    @property
+    def solution(self):
+        """Returns a copy of the set of scoring words on the board"""
+        return set(self._points)
+
+    @property
+    def maxScore(self):
+        return self._maxScore
+
+    def _verdict(self, word):
+        """Returns the name of the Grade list the rejected word belongs in"""
+        verdict = self._verdicts.get(word)
+        if verdict is None:
+            if len(word) < self._rules.minLength:
+                verdict = "short"
+            elif word in self._lexicon:
+                verdict = "notOnBoard"
+            else:
+                verdict = "notWords"
+            self._verdicts[word] = verdict
+        return verdict
+
+    def grade(self, words):
+        """Given one player's submitted words (an iterable of str), returns
+        their Grade"""
+        start = perf_counter()
+        submitted = [word.strip().lower() for word in words]
+        unique = set(submitted)
+        unique.discard('')
+        if len(unique) < len(submitted):
+            seen = set()
+            duplicates = sorted({word for word in submitted
+                                 if word in seen or seen.add(word)} - {''})
+        else:
+            duplicates = []
+
+        points = self._points
+        accepted = unique & self._solution
+        rejected = {"short": [], "notWords": [], "notOnBoard": []}
+        if len(accepted) < len(unique):
+            verdict = self._verdict
+            for word in unique - accepted:
+                rejected[verdict(word)].append(word)
+        grade = Grade(sorted(accepted), sum(map(points.__getitem__, accepted)), duplicates,
+                      sorted(rejected["short"]), sorted(rejected["notWords"]),
+                      sorted(rejected["notOnBoard"]))
+        self.graded += 1
+        self.gradeTime += perf_counter() - start
+        return grade
+
+    def gradeAll(self, submissions):
+        """Grades many submissions: given a dict mapping each player to
+        their words, returns a dict mapping each player to their Grade;
+        given a list of word lists, returns the list of Grades in order"""
+        if hasattr(submissions, 'items'):
+            return {player: self.grade(words) for player, words in submissions.items()}
+        return [self.grade(words) for words in submissions]
+
+
+def gradeSubmissions(solver, tiles, submissions, lexicon=None, rules=None):
+    """Solves the board with tiles once with solver (a SolverEngine or
+    SolveCache) and grades every submission against it, as
+    Grader.gradeAll"""
+    return Grader(solver, tiles, lexicon, rules).gradeAll(submissions)
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
+
+    from bogglegrid import BoggleGrid
+    from bogglesolver import SolverEngine
+    from lexiconcache import loadLexicon
+    from myrandom import BoggleRandom
+
+    lex = loadLexicon()
+    engine = SolverEngine(4, 4, lex)
+    rng = BoggleRandom(1)
+    grid = BoggleGrid()
+    grid.shakeCubes(rng=rng)
+    while len(engine.findWords(grid.tiles)) < 60:
+        grid.shakeCubes(rng=rng)
+    start = perf_counter()
+    grader = Grader(engine, grid.tiles, lex)
+    solveTime = perf_counter() - start
+
+    # players find some of the words and add misses, misspellings and repeats
+    onBoard = sorted(grader.solution)
+    misses = ["boggle", "quiet", "zebra", "tea", "art"]
+    typos = ["xq", "aa", "tqe", "zzzt"]
+    submissions = {}
+    for player in range(1000):
+        words = [onBoard[rng.randint(0, len(onBoard) - 1)] for i in range(40)]
+        words += [misses[rng.randint(0, len(misses) - 1)] for i in range(5)]
+        words += [typos[rng.randint(0, len(typos) - 1)] for i in range(5)]
+        submissions['player{}'.format(player)] = words
+    grades = grader.gradeAll(submissions)
+    best = max(grades, key=lambda player: grades[player].score)
+    print(grid)
+    print("{} words on the board, {} points; best {} with {}".format(
+        len(onBoard), grader.maxScore, best, grades[best]))
+    print("solved in {:.2f} ms, graded {} submissions in {:.2f} ms".format(
+        solveTime * 1e3, grader.graded, grader.gradeTime * 1e3))
@@ -0,0 +1,260 @@
+# Incremental Boggle solver
+"""Keeps the solution of a board up to date as single tiles change, for
+board editors and local search.  After one tile changes, only paths
+through that cell can appear or disappear, so only those are searched."""
+
+from time import perf_counter
+from bogglelexicon import ROOT, TERMINAL
+from bogglesolver import MIN_LENGTH, neighborTable, tileLetters
+from scoring import rulesFor
+
+class IncrementalSolver:
+    """The words on a board, kept current as tiles change, with attributes:
+       *  _engine is the SolverEngine whose grid size and lexicon are used
+       *  _rules are the ScoringRules words are scored with
+       *  _tiles, _texts are the row major lists of tile strings, as given
+          and in lower case
+       *  _heads, _tails are the trie mask bit of each tile's first letter
+          and the letter indices of the rest (see SolverEngine.findWords)
+       *  _ends is, for each cell, the list of every path ending on that
+          cell that spells a prefix in the lexicon, each as a tuple
+          (node, used, word, isWord) of the lexicon node reached, the
+          bitmask of cells used, the letters and whether it spells a
+          scoring word
+       *  _paths is a dict mapping each word on the board to the list of
+          bitmasks of the cells used by every path spelling it
+       *  _score (int) is the total score of the words
+       *  edits (int) and editTime (float) total the tile changes made and
+          the seconds spent updating for them
+    Paths that avoid a changed cell do not change, so an edit drops the
+    paths through the cell and grows new ones from the paths that end next
+    to it, instead of searching the whole board again.
+    >>> from bogglelexicon import BoggleLexicon
+    >>> from bogglesolver import SolverEngine
+    >>> lex = BoggleLexicon.fromWords(["art", "tar", "rat", "rap", "part", "pea"])
+    >>> solver = IncrementalSolver(SolverEngine(2, 2, lex), ["P", "A", "R", "T"])
+    >>> sorted(solver.words), solver.score
+    (['art', 'part', 'rap', 'rat', 'tar'], 5)
+    >>> solver.setLetter((1, 1), "E")     # T -> E
+    (['pea'], ['art', 'part', 'rat', 'tar'])
+    >>> solver.setTile(3, "T")
+    (['art', 'part', 'rat', 'tar'], ['pea'])
+    """
+
+    __slots__ = ['_engine', '_rules', '_tiles', '_texts', '_heads', '_tails',
+                 '_ends', '_paths', '_score', 'edits', 'editTime']
+
+    def __init__(self, engine, tiles, rules=None):
+        self._engine = engine
+        self._rules = rules if rules is not None else rulesFor(engine.rows, engine.cols)
+        self._tiles = list(tiles)
+        self._texts = [tile.lower() for tile in self._tiles]
+        letters = tileLetters(self._texts)
+        self._heads = [1 << idx[0] for idx in letters]
+        self._tails = [idx[1:] for idx in letters]
+        self._ends = [[] for tile in self._tiles]
+        self._paths = {}
+        self._score = 0
+        self.edits = 0
+        self.editTime = 0.0
+        lex = engine.lexicon
+        seeds = []
+        for cell, text in enumerate(self._texts):
+            node = lex.step(ROOT, text) if text else -1
+            if node >= 0:
+                seeds.append((cell, node, text, 1 << cell))
+        self._grow(seeds, set())
+
+    @classmethod
+    def fromGrid(cls, grid, lex, rules=None):
+        """Returns an IncrementalSolver for the tiles of a BoggleGrid or
+        BoggleBoard grid, searching with the BoggleLexicon lex"""
+        from bogglesolver import SolverEngine
+        return cls(SolverEngine(grid.rows, grid.cols, lex), grid.tiles, rules)
+
+    # getter methods for attributes
+    @property
+    def tiles(self):
+        """Returns a copy of the row major list of tile strings"""
+        return list(self._tiles)
+
+    @property
+    def words(self):
+        """Returns a dict mapping each word on the board to the cells of
+        one path spelling it, like SolverEngine.findWords"""
+        return {word: self._trace(word, paths[0]) for word, paths in self._paths.items()}
+
+    @property
+    def score(self):
+        return self._score
+
+    def _grow(self, seeds, gained):
+        """Records every prefix path extending the seed paths, each seed a
+        tuple (cell, node, word, used) for a path ending on cell.  Words
+        that were not on the board are added to the set gained."""
+        engine = self._engine
+        lex = engine.lexicon
+        masks = lex.masks
+        firsts = lex.firsts
+        neighbors = neighborTable(engine.rows, engine.cols)
+        texts = self._texts
+        heads = self._heads
+        tails = self._tails
+        ends = self._ends
+        paths = self._paths
+        rules = self._rules
+
+        def visit(cell, node, word, used):
+            mask = masks[node]
+            isWord = mask & TERMINAL and len(word) >= MIN_LENGTH
+            ends[cell].append((node, used, word, isWord))
+            if isWord:
+                wordPaths = paths.get(word)
+                if wordPaths is None:
+                    paths[word] = [used]
+                    self._score += rules.scoreWord(word)
+                    gained.add(word)
+                else:
+                    wordPaths.append(used)
+            first = firsts[node]
+            for nxt, bit in neighbors[cell]:
+                head = heads[nxt]
+                if used & bit or not mask & head:
+                    continue
+                child = first + (mask & (head - 1)).bit_count()
+                for idx in tails[nxt]:
+                    childMask = masks[child]
+                    tail = 1 << idx
+                    if not childMask & tail:
+                        break
+                    child = firsts[child] + (childMask & (tail - 1)).bit_count()
+                else:
+                    visit(nxt, child, word + texts[nxt], used | bit)
+
+        for cell, node, word, used in seeds:
+            visit(cell, node, word, used)
+
+    def _trace(self, word, used):
+        """Returns the tuple of cells of a path spelling word that uses
+        exactly the cells in the bitmask used"""
+        texts = self._texts
+        neighbors = neighborTable(self._engine.rows, self._engine.cols)
+
+        def extend(cell, pos, left, path):
+            text = texts[cell]
+            if not text or not word.startswith(text, pos):
+                return None
+            pos += len(text)
+            path = path + (cell,)
+            if not left:
+                return path if pos == len(word) else None
+            for nxt, bit in neighbors[cell]:
+                if left & bit:
+                    found = extend(nxt, pos, left & ~bit, path)
+                    if found is not None:
+                        return found
+            return None
+
+        for cell in range(len(texts)):
+            if used >> cell & 1:
+                found = extend(cell, 0, used & ~(1 << cell), ())
+                if found is not None:
+                    return found
+        return None
+
+    def setLetter(self, pos, alph):
+        """Sets the tile at grid position pos, a tuple of (col, row), to
+        alph and returns (added, removed) as for setTile"""
+        return self.setTile(pos[1] * self._engine.cols + pos[0], alph)
+
+    def setTile(self, cell, tile):
+        """Sets the tile on cell (row major index) to the string tile and
+        updates the words and score.  Returns (added, removed): the sorted
+        lists of words that appeared and disappeared."""
+        if self._tiles[cell] == tile:
+            return [], []
+        start = perf_counter()
+        bit = 1 << cell
+        ends = self._ends
+        paths = self._paths
+
+        # drop every path through the cell, and words left with no path
+        lost = set()
+        for other, entries in enumerate(ends):
+            dropped = [entry for entry in entries if entry[1] & bit]
+            if not dropped:
+                continue
+            ends[other] = [entry for entry in entries if not entry[1] & bit]
+            for node, used, word, isWord in dropped:
+                if isWord:
+                    wordPaths = paths[word]
+                    wordPaths.remove(used)
+                    if not wordPaths:
+                        del paths[word]
+                        self._score -= self._rules.scoreWord(word)
+                        lost.add(word)
+
+        # grow paths through the new tile: starting on it, or continuing
+        # a path that ends on a neighbor
+        self._tiles[cell] = tile
+        text = self._texts[cell] = tile.lower()
+        letters = tileLetters([text])[0]
+        head = self._heads[cell] = 1 << letters[0]
+        tail = self._tails[cell] = letters[1:]
+        lex = self._engine.lexicon
+        masks = lex.masks
+        seeds = []
+        if text:
+            node = lex.step(ROOT, text)
+            if node >= 0:
+                seeds.append((cell, node, text, bit))
+            firsts = lex.firsts
+            below = head - 1
+            for nxt, nextBit in neighborTable(self._engine.rows, self._engine.cols)[cell]:
+                for node, used, word, isWord in [
+                        entry for entry in ends[nxt] if masks[entry[0]] & head]:
+                    child = firsts[node] + (masks[node] & below).bit_count()
+                    if tail:
+                        child = lex.step(child, text[1:])
+                        if child < 0:
+                            continue
+                    seeds.append((cell, child, word + text, used | bit))
+        gained = set()
+        self._grow(seeds, gained)
+
+        self.edits += 1
+        self.editTime += perf_counter() - start
+        return sorted(gained - lost), sorted(lost - gained)
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __contains__(self, word):
+        return word in self._paths
+
+    def __repr__(self):
+        return "IncrementalSolver({} words, {} points)".format(len(self._paths), self._score)
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
+
+    from bogglegrid import BoggleGrid, CUBES
+    from bogglesolver import SolverEngine
+    from lexiconcache import loadLexicon
+    from myrandom import BoggleRandom
+
+    engine = SolverEngine(4, 4, loadLexicon())
+    grid = BoggleGrid()
+    rng = BoggleRandom(1)
+    grid.shakeCubes(rng=rng)
+    solver = IncrementalSolver(engine, grid.tiles)
+    engine.boardsSolved, engine.solveTime = 0, 0.0
+    for i in range(500):
+        cell = rng.randint(0, 15)
+        solver.setTile(cell, CUBES[rng.randint(0, 15)][rng.randint(0, 5)])
+        engine.findWords(solver.tiles)
+    print(solver)
+    print("{:.0f} us per edit, {:.0f} us per full solve".format(
+        solver.editTime / solver.edits * 1e6, engine.solveTime / engine.boardsSolved * 1e6))
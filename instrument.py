@@ -0,0 +1,280 @@
+# Boggle instrumentation
+"""Opt-in timers, counters and stack sampling for finding where the game
+spends its time.  Nothing is instrumented until enable() is called: it
+wraps the hot methods listed in TARGETS with timing wrappers, and
+disable() puts the original methods back, so a game that never enables
+instrumentation runs exactly the code it would without this module.
+
+    import instrument
+    instrument.enable(sample=True)
+    ...                                  # play
+    print(instrument.summary())
+    instrument.writeStacks('boggle.folded')  # for flamegraph.pl / speedscope
+"""
+
+import functools
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# (module, class, method, timer name) of the methods enable() wraps; only
+# modules already imported (or run as the main script) are instrumented
+TARGETS = [
+    ('game', 'BoggleGame', 'onClick', 'game.click'),
+    ('game', 'BoggleGame', 'tick', 'game.tick'),
+    ('boggleboard', 'BoggleBoard', 'render', 'board.render'),
+    ('bogglewords', 'BoggleWords', 'addLetter', 'words.addLetter'),
+    ('bogglewords', 'BoggleWords', 'addWord', 'words.addWord'),
+    ('bogglelexicon', 'BoggleLexicon', 'step', 'lexicon.step'),
+    ('bogglelexicon', 'BoggleLexicon', 'isWord', 'lexicon.isWord'),
+    ('bogglelexicon', 'BoggleLexicon', 'isPrefix', 'lexicon.isPrefix'),
+    ('bogglelexicon', 'BoggleLexicon', '__contains__', 'lexicon.contains'),
+    ('bogglesolver', 'SolverEngine', 'findWords', 'solver.findWords'),
+]
+
+
+class Stats:
+    """Running totals for one named timer, with attributes:
+       *  count (int) is the number of timed calls
+       *  total (float) is the seconds spent in them
+       *  max (float) is the longest call in seconds
+    >>> stats = Stats()
+    >>> stats.add(0.5); stats.add(1.5)
+    >>> stats.count, stats.total, stats.mean, stats.max
+    (2, 2.0, 1.0, 1.5)
+    """
+
+    __slots__ = ['count', 'total', 'max']
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def clear(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, elapsed):
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+
+class Sampler(threading.Thread):
+    """Daemon thread that records the stack of the thread being profiled
+    every interval seconds, counting identical stacks in stacks (a Counter
+    of root first tuples of "module:function" frames)"""
+
+    def __init__(self, threadId, interval=0.005):
+        super().__init__(name='boggle-sampler', daemon=True)
+        self.threadId = threadId
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self.threadId)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                module = frame.f_globals.get('__name__', '?')
+                stack.append('{}:{}'.format(module, code.co_name))
+                frame = frame.f_back
+            if stack:
+                stack.reverse()
+                self.stacks[tuple(stack)] += 1
+                self.samples += 1
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+_timers = {}        # timer name -> Stats
+_counters = Counter()
+_busy = Stats()     # time spent in outermost instrumented calls
+_patched = []       # (class, method name, original) restored by disable()
+_sampler = None
+_depth = 0          # nesting of instrumented calls in progress
+_started = None     # perf_counter() when enabled
+
+
+def isEnabled():
+    """Returns True while instrumentation is enabled"""
+    return _started is not None
+
+
+def stats(name):
+    """Returns the Stats of the timer name, creating it if needed"""
+    timer = _timers.get(name)
+    if timer is None:
+        timer = _timers[name] = Stats()
+    return timer
+
+
+def count(name, n=1):
+    """Adds n to the counter name (only while enabled)"""
+    if _started is not None:
+        _counters[name] += n
+
+
+@contextmanager
+def timer(name):
+    """Context manager timing its block under name (only while enabled)
+    >>> enable()
+    >>> with timer('demo'):
+    ...     pass
+    >>> stats('demo').count
+    1
+    >>> disable(); reset()
+    """
+    if _started is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats(name).add(time.perf_counter() - start)
+
+
+def timed(func, name):
+    """Returns func wrapped to time each call under name, counting the
+    outermost calls towards the busy total"""
+    timerStats = stats(name)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        global _depth
+        _depth += 1
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            _depth -= 1
+            timerStats.add(elapsed)
+            if not _depth:
+                _busy.add(elapsed)
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+def enable(sample=False, interval=0.005):
+    """Starts instrumenting: wraps the TARGETS methods of already imported
+    modules and, if sample is True, samples the calling thread's stack
+    every interval seconds.  Import the game's modules before calling."""
+    global _sampler, _started
+    if _started is not None:
+        return
+    for moduleName, className, method, name in TARGETS:
+        cls = getattr(sys.modules.get(moduleName), className, None)
+        if cls is None:
+            # e.g. BoggleGame when game.py is run as a script
+            cls = getattr(sys.modules.get('__main__'), className, None)
+        if cls is None or method not in cls.__dict__:
+            continue
+        original = cls.__dict__[method]
+        _patched.append((cls, method, original))
+        setattr(cls, method, timed(original, name))
+    if sample:
+        _sampler = Sampler(threading.get_ident(), interval)
+        _sampler.start()
+    _started = time.perf_counter()
+
+
+def disable():
+    """Stops instrumenting and restores the original methods; the totals
+    are kept until reset()"""
+    global _sampler, _started
+    while _patched:
+        cls, method, original = _patched.pop()
+        setattr(cls, method, original)
+    if _sampler is not None:
+        _sampler.stop()
+    if _started is not None:
+        _counters['session seconds'] += time.perf_counter() - _started
+    _started = None
+
+
+def reset():
+    """Clears every timer, counter and sample"""
+    global _sampler
+    for timerStats in _timers.values():
+        timerStats.clear()   # wrappers keep their Stats, so clear in place
+    _counters.clear()
+    _busy.clear()
+    if _sampler is not None and not _sampler.is_alive():
+        _sampler = None
+
+
+def summary():
+    """Returns a text report of the session: wall time split into time in
+    instrumented calls and the rest (mostly waiting for events), then each
+    timer and counter"""
+    wall = _counters.get('session seconds', 0.0)
+    if _started is not None:
+        wall += time.perf_counter() - _started
+    lines = ['session {:.2f} s, busy {:.3f} s ({:.1f}%), idle {:.2f} s, {} events'.format(
+        wall, _busy.total, 100 * _busy.total / wall if wall else 0.0,
+        wall - _busy.total, _busy.count)]
+    lines.append('{:<20} {:>8} {:>11} {:>10} {:>10}'.format(
+        'timer', 'calls', 'total ms', 'mean us', 'max us'))
+    for name, timer in sorted(_timers.items(), key=lambda item: -item[1].total):
+        if timer.count:
+            lines.append('{:<20} {:>8} {:>11.3f} {:>10.1f} {:>10.1f}'.format(
+                name, timer.count, timer.total * 1e3, timer.mean * 1e6, timer.max * 1e6))
+    for name, value in sorted(_counters.items()):
+        if name != 'session seconds':
+            lines.append('{:<20} {:>8}'.format(name, value))
+    if _sampler is not None:
+        lines.append('{} stack samples every {:.1f} ms'.format(
+            _sampler.samples, _sampler.interval * 1e3))
+    return '\n'.join(lines)
+
+
+def foldedStacks():
+    """Returns the sampled stacks in the folded format read by flamegraph.pl
+    and speedscope: one "root;...;leaf count" line per distinct stack"""
+    if _sampler is None:
+        return ''
+    return ''.join('{} {}\n'.format(';'.join(stack), n)
+                   for stack, n in sorted(_sampler.stacks.items()))
+
+
+def writeStacks(path):
+    """Writes foldedStacks() to the file path"""
+    with open(path, 'w') as f:
+        f.write(foldedStacks())
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
+
+    from bogglegrid import BoggleGrid
+    from bogglesolver import SolverEngine
+    from lexiconcache import loadLexicon
+
+    engine = SolverEngine(4, 4, loadLexicon())
+    grid = BoggleGrid()
+    enable(sample=True, interval=0.001)
+    for i in range(200):
+        grid.shakeCubes()
+        with timer('shake+solve'):
+            engine.findWords(grid.tiles)
+        count('boards')
+    disable()
+    print(summary())
+    print(foldedStacks().splitlines()[0])
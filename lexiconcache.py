@@ -0,0 +1,194 @@
+# Compiled lexicon cache
+"""Compiles bogwords.txt into a binary flattened trie that can be memory
+mapped and queried without parsing.  The cache records a hash of its
+source file and is rebuilt automatically when the source changes.
+The same layout can be placed in a shared memory block that pool workers
+attach to, so every process reads one copy of the lexicon.  A lexicon
+pruned to the words one cube set can spell (see cubelexicon) is cached
+beside the full one, keyed by the source and the cube set.
+
+File layout (native byte order):
+    MAGIC (8 bytes) | source sha256 (32 bytes) | node count | word count
+    | node masks (node count x uint32) | first children (node count x uint32)
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from multiprocessing import shared_memory
+from bogglelexicon import BoggleLexicon
+
+MAGIC = b'BOGLEX01' if sys.byteorder == 'little' else b'BOGLEX0B'
+HEADER = struct.Struct('=8s32sII')
+
+_attached = {}  # shared memory blocks attached by this process, by name
+
+
+def sourceHash(source):
+    """Returns the sha256 digest (bytes) of the file source"""
+    with open(source, 'rb') as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+def cacheDigest(source, cubes=None):
+    """Returns the digest (bytes) a cache compiled from source, pruned to
+    the cube set cubes if given, records"""
+    digest = sourceHash(source)
+    if cubes is not None:
+        from cubelexicon import cubesKey
+        digest = hashlib.sha256(digest + cubesKey(cubes).encode()).digest()
+    return digest
+
+
+def cachePath(source, cubes=None):
+    """Returns the path of the compiled cache for source, e.g.
+    'bogwords.lex' for 'bogwords.txt', or 'bogwords.<cube set key>.lex'
+    for the lexicon pruned to the cube set cubes"""
+    base = os.path.splitext(source)[0]
+    if cubes is None:
+        return base + '.lex'
+    from cubelexicon import cubesKey
+    return '{}.{}.lex'.format(base, cubesKey(cubes))
+
+
+def compileLexicon(source='bogwords.txt', target=None, lex=None, cubes=None):
+    """Compiles the word list in source (or the given BoggleLexicon lex) to
+    the binary file target and returns the target path.  With a cube set
+    cubes, only the words it can spell are compiled."""
+    if target is None:
+        target = cachePath(source, cubes)
+    if lex is None:
+        if cubes is None:
+            lex = BoggleLexicon.fromFile(source)
+        else:
+            from cubelexicon import pruneLexicon
+            lex = pruneLexicon(source, cubes)
+    header = HEADER.pack(MAGIC, cacheDigest(source, cubes), lex.nodeCount, len(lex))
+    temp = '{}.{}.tmp'.format(target, os.getpid())
+    with open(temp, 'wb') as f:
+        f.write(header)
+        f.write(bytes(lex.masks))
+        f.write(bytes(lex.firsts))
+    os.replace(temp, target)    # readers never see a half written file
+    return target
+
+
+def isFresh(source='bogwords.txt', target=None, cubes=None):
+    """Returns True if target exists and was compiled from the current
+    contents of source (and the cube set cubes, if given)"""
+    if target is None:
+        target = cachePath(source, cubes)
+    try:
+        with open(target, 'rb') as f:
+            header = f.read(HEADER.size)
+    except OSError:
+        return False
+    if len(header) < HEADER.size:
+        return False
+    magic, digest, nodes, words = HEADER.unpack(header)
+    return magic == MAGIC and digest == cacheDigest(source, cubes) and \
+        os.path.getsize(target) == HEADER.size + nodes * 8
+
+
+def viewLexicon(buf, name='buffer'):
+    """Returns a BoggleLexicon that reads its nodes directly from buf, a
+    buffer holding a compiled lexicon (name is used in errors)"""
+    magic, digest, nodes, words = HEADER.unpack_from(buf)
+    if magic != MAGIC:
+        raise ValueError("{} is not a compiled lexicon".format(name))
+    view = memoryview(buf)
+    start = HEADER.size
+    masks = view[start:start + nodes * 4].cast('I')
+    firsts = view[start + nodes * 4:start + nodes * 8].cast('I')
+    return BoggleLexicon(masks, firsts, words)
+
+
+def openLexicon(target):
+    """Memory maps the compiled lexicon target and returns a BoggleLexicon
+    that reads its nodes directly from the mapping"""
+    with open(target, 'rb') as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return viewLexicon(buf, target)
+
+
+def shareLexicon(lex):
+    """Copies the BoggleLexicon lex into a new shared memory block, laid out
+    like a compiled cache, and returns the SharedMemory.  Pass its name to
+    attachLexicon in other processes.  The caller owns the block and must
+    close() and unlink() it when the workers are done.
+    >>> lex = BoggleLexicon.fromWords(["art", "tar", "party"])
+    >>> block = shareLexicon(lex)
+    >>> shared = attachLexicon(block.name)
+    >>> shared.isWord("tar"), shared.isPrefix("par"), len(shared)
+    (True, True, 3)
+    >>> del shared; detachLexicon(block.name); block.close(); block.unlink()
+    """
+    nodes = lex.nodeCount
+    block = shared_memory.SharedMemory(create=True, size=HEADER.size + nodes * 8)
+    buf = block.buf
+    HEADER.pack_into(buf, 0, MAGIC, bytes(32), nodes, len(lex))
+    start = HEADER.size
+    buf[start:start + nodes * 4] = bytes(lex.masks)
+    buf[start + nodes * 4:start + nodes * 8] = bytes(lex.firsts)
+    return block
+
+
+def attachLexicon(name):
+    """Attaches to the shared memory block name made by shareLexicon and
+    returns a BoggleLexicon reading from it.  Attaching copies and hashes
+    nothing, so it costs the same for any lexicon size; the block stays
+    attached until detachLexicon(name) or the process exits."""
+    block = _attached.get(name)
+    if block is None:
+        block = shared_memory.SharedMemory(name=name)
+        _attached[name] = block
+    return viewLexicon(block.buf, name)
+
+
+def detachLexicon(name):
+    """Detaches this process from the shared memory block name.  Every
+    lexicon returned by attachLexicon(name) must be deleted first; if one is
+    still alive, raises BufferError and stays attached."""
+    block = _attached.pop(name, None)
+    if block is not None:
+        try:
+            block.close()
+        except BufferError:
+            _attached[name] = block
+            raise
+
+
+def loadLexicon(source='bogwords.txt', target=None, cubes=None):
+    """Returns a memory mapped BoggleLexicon for source, compiling it to
+    target first if the cache is missing or out of date.  Falls back to an
+    in-memory lexicon if the cache cannot be written.  With a cube set
+    cubes, the lexicon holds only the words it can spell: use it only to
+    solve boards shaken from that cube set."""
+    if target is None:
+        target = cachePath(source, cubes)
+    if not isFresh(source, target, cubes):
+        try:
+            compileLexicon(source, target, cubes=cubes)
+        except OSError:
+            if cubes is None:
+                return BoggleLexicon.fromFile(source)
+            from cubelexicon import pruneLexicon
+            return pruneLexicon(source, cubes)
+    return openLexicon(target)
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
+
+    import time
+    start = time.perf_counter()
+    target = compileLexicon()
+    print("compiled {} in {:.1f} ms".format(target, (time.perf_counter() - start) * 1000))
+
+    start = time.perf_counter()
+    lex = loadLexicon()
+    print("loaded {} in {:.2f} ms".format(lex, (time.perf_counter() - start) * 1000))
+    print("quiet: {}, qui: {}".format(lex.isWord("quiet"), lex.isPrefix("qui")))
@@ -0,0 +1,110 @@
+# script loadtest.py
+"""Load tests the Boggle game server with bot players.  Each bot opens a
+session, starts a round and submits a mix of words: words on the board
+(found with its own solver), repeats and words that are not on it.  The
+round trip of every command is timed and reported with percentiles.
+
+    python loadtest.py --bots 2000 --words 20             # in-process server
+    python loadtest.py --port 8765 --bots 2000            # running server
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from benchmark import percentile
+from bogglesolver import SolverEngine
+from gameserver import GameServer
+from lexiconcache import loadLexicon
+from myrandom import BoggleRandom
+
+JUNK = ['zzzq', 'boggle', 'xylophone', 'quiet', 'aardvark']
+
+
+async def command(reader, writer, line, latencies):
+    """Sends one command line and returns the reply, recording its round trip"""
+    start = time.perf_counter()
+    writer.write(line.encode('ascii') + b'\n')
+    reply = await reader.readline()
+    latencies.append(time.perf_counter() - start)
+    return reply.decode('ascii').rstrip('\n')
+
+
+async def bot(host, port, words, size, engines, rng, latencies, replies):
+    """Plays one session: NEW, then words WORD commands, STATUS and QUIT"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        board = await command(reader, writer, 'NEW {}'.format(size), latencies)
+        tiles = board.split(' ', 3)[3].split(',')
+        onBoard = sorted(engines[size].findWords(tiles))
+        for i in range(words):
+            pick = rng.randint(0, 3)
+            if pick == 0 or not onBoard:
+                word = JUNK[rng.randint(0, len(JUNK) - 1)]
+            else:
+                word = onBoard[rng.randint(0, len(onBoard) - 1)]
+            reply = await command(reader, writer, 'WORD ' + word, latencies)
+            kind = reply.split(' ', 1)[0]
+            replies[kind] = replies.get(kind, 0) + 1
+        await command(reader, writer, 'STATUS', latencies)
+        await command(reader, writer, 'QUIT', latencies)
+    finally:
+        writer.close()
+
+
+async def run(host, port, bots, words, size, seed=None, server=None):
+    """Runs bots concurrent bot sessions against host:port, starting an
+    in-process GameServer first if server is given.  Returns a dict of results."""
+    listener = None
+    if server is not None:
+        listener = await server.start(host, port)
+        port = listener.sockets[0].getsockname()[1]
+    rng = BoggleRandom(seed)
+    engines = {size: SolverEngine(size, size, loadLexicon())}
+    latencies = []
+    replies = {}
+    start = time.perf_counter()
+    await asyncio.gather(*[bot(host, port, words, size, engines, rng.spawn(i),
+                               latencies, replies) for i in range(bots)])
+    elapsed = time.perf_counter() - start
+    if listener is not None:
+        listener.close()
+        await listener.wait_closed()
+    latencies.sort()
+    results = {'bots': bots, 'requests': len(latencies), 'seconds': elapsed,
+               'requests/s': len(latencies) / elapsed,
+               'p50': percentile(latencies, 0.5), 'p99': percentile(latencies, 0.99),
+               'max': latencies[-1], 'replies': replies}
+    if server is not None:
+        results['server us/request'] = server.handleTime / server.requests * 1e6
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--host', default='127.0.0.1', help='server address')
+    parser.add_argument('--port', type=int, default=None,
+                        help='server port (default: start a server in this process)')
+    parser.add_argument('--bots', type=int, default=1000, help='concurrent sessions')
+    parser.add_argument('--words', type=int, default=20, help='words each bot submits')
+    parser.add_argument('--size', type=int, default=4, help='board size')
+    parser.add_argument('--seed', type=int, default=None, help='seed for the bots')
+    args = parser.parse_args(argv)
+
+    server = None
+    port = args.port
+    if port is None:
+        server = GameServer(loadLexicon(), seed=args.seed)
+        port = 0
+    results = asyncio.run(run(args.host, port, args.bots, args.words, args.size,
+                              args.seed, server))
+    for name, value in results.items():
+        if name in ('p50', 'p99', 'max'):
+            value = '{:.2f} ms'.format(value * 1e3)
+        elif isinstance(value, float):
+            value = '{:.1f}'.format(value)
+        print('{:<18} {}'.format(name, value), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
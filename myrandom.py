@@ -1,7 +1,93 @@
+"""Seedable random number streams for shaking boards.
+
+Each BoggleRandom owns its own random.Random, so a board can be reproduced
+from its seed and shaking never touches the global random module.  Use
+spawn() to derive independent, reproducible streams for workers or game
+sessions."""
+
+import hashlib
 import random
 
+
+class BoggleRandom:
+    """A reproducible stream of random numbers with attributes:
+       *  _seed (int) is the seed the stream was created from
+       *  _random is the underlying random.Random generator
+    >>> a, b = BoggleRandom(42), BoggleRandom(42)
+    >>> [a.randint(0, 9) for i in range(5)] == [b.randint(0, 9) for i in range(5)]
+    True
+    >>> a.randints(0, 9, 100) == b.randints(0, 9, 100)
+    True
+    >>> a.spawn(1).seed == b.spawn(1).seed != a.spawn(2).seed
+    True
+    """
+
+    __slots__ = ['_seed', '_random']
+
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self._seed = seed
+        self._random = random.Random(seed)
+
+    @property
+    def seed(self):
+        """Returns the seed this stream was created from"""
+        return self._seed
+
+    def randint(self, start, end):
+        """Returns a random int N with start <= N <= end"""
+        return self._random.randint(start, end)
+
+    def random(self):
+        """Returns a random float N with 0 <= N < 1"""
+        return self._random.random()
+
+    def randints(self, start, end, count):
+        """Returns a list of count random ints N with start <= N <= end,
+        drawn in one call"""
+        return self._random.choices(range(start, end + 1), k=count)
+
+    def shuffle(self, items):
+        """Shuffles the list items in place"""
+        self._random.shuffle(items)
+
+    def getrandbits(self, bits):
+        """Returns a random int with bits random bits"""
+        return self._random.getrandbits(bits)
+
+    def spawn(self, key):
+        """Returns a new BoggleRandom whose seed is derived from this
+        stream's seed and key (for example a worker or session number).
+        The same seed and key always give the same stream."""
+        digest = hashlib.blake2b('{}/{}'.format(self._seed, key).encode(),
+                                 digest_size=8).digest()
+        return BoggleRandom(int.from_bytes(digest, 'little'))
+
+    def __repr__(self):
+        return "BoggleRandom({})".format(self._seed)
+
+
+# stream used when callers do not pass their own
+_default = BoggleRandom()
+
+
+def default():
+    """Returns the module's default BoggleRandom"""
+    return _default
+
+
+def seed(value=None):
+    """Reseeds the module's default stream with value"""
+    global _default
+    _default = BoggleRandom(value)
+
+
 def randint(start, end):
-    default = random.randint(0, 100000000)
-    random.seed(default)
-    val = random.randint(start, end)
-    return val
+    """Returns a random int N with start <= N <= end from the default stream"""
+    return _default.randint(start, end)
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
@@ -0,0 +1,104 @@
+# Boggle scoring rules
+"""Table driven scoring for Boggle words, with the classic and Big Boggle
+rule sets built in and support for custom house rules."""
+
+MAX_LENGTH = 40  # longest word length with its own precomputed score
+
+
+class ScoringRules:
+    """A set of scoring rules with attributes:
+       *  _name (str) names the rules
+       *  _table is a dict mapping word length to points; words longer than
+          the longest length in the table score that length's points
+       *  _minLength (int) is the shortest word that scores at all
+       *  _scores is a list of the points for each length up to MAX_LENGTH
+    Word length counts letters, so the "Qu" tile counts as two.
+    >>> CLASSIC.scoreWord("art"), CLASSIC.scoreWord("quiet"), CLASSIC.scoreWord("quietude")
+    (1, 2, 11)
+    >>> BIG.scoreWord("art"), BIG.scoreWords(["part", "party", "parties"])
+    (0, 8)
+    >>> house = ScoringRules("house", {3: 1, 6: 4}, 3)
+    >>> [house.scoreWord(w) for w in ["at", "art", "party", "parties"]]
+    [0, 1, 1, 4]
+    """
+
+    __slots__ = ['_name', '_table', '_minLength', '_scores']
+
+    def __init__(self, name, table, minLength=3):
+        self._name = name
+        self._table = dict(table)
+        self._minLength = minLength
+
+        # points for each word length, carrying each table entry forward
+        self._scores = []
+        points = 0
+        for length in range(MAX_LENGTH + 1):
+            points = self._table.get(length, points)
+            self._scores.append(points if length >= minLength else 0)
+
+    # getter methods for attributes
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def table(self):
+        """Returns a copy of the length to points table"""
+        return dict(self._table)
+
+    @property
+    def minLength(self):
+        return self._minLength
+
+    def scoreWord(self, word):
+        """Returns the points for word (str)"""
+        length = len(word)
+        if length > MAX_LENGTH:
+            length = MAX_LENGTH
+        return self._scores[length]
+
+    def scoreWords(self, words):
+        """Returns the total points for an iterable of words"""
+        scores = self._scores
+        return sum(scores[min(len(word), MAX_LENGTH)] for word in words)
+
+    def maxScore(self, engine, tiles):
+        """Returns the highest score possible on a board: the total points
+        of every word a SolverEngine engine finds in the row major list of
+        tile strings tiles"""
+        return self.scoreWords(engine.findWords(tiles))
+
+    def __repr__(self):
+        return "ScoringRules({!r}, {}, {})".format(self._name, self._table, self._minLength)
+
+
+# classic 4x4 Boggle
+CLASSIC = ScoringRules("classic", {3: 1, 4: 1, 5: 2, 6: 3, 7: 5, 8: 11}, 3)
+
+# Big Boggle (5x5): three letter words do not count
+BIG = ScoringRules("big", {4: 1, 5: 2, 6: 3, 7: 5, 8: 11}, 4)
+
+# Super Big Boggle (6x6) scores like Big Boggle
+SUPER = ScoringRules("super", {4: 1, 5: 2, 6: 3, 7: 5, 8: 11}, 4)
+
+# rule sets by name
+RULES = {rules.name: rules for rules in (CLASSIC, BIG, SUPER)}
+
+
+def rulesFor(rows, cols):
+    """Returns the standard rules for a rows x cols board: classic for 4x4
+    and smaller, Big Boggle for 5x5 and Super Big Boggle for larger boards
+    >>> rulesFor(4, 4).name, rulesFor(5, 5).name, rulesFor(6, 6).name
+    ('classic', 'big', 'super')
+    """
+    cells = rows * cols
+    if cells <= 16:
+        return CLASSIC
+    elif cells <= 25:
+        return BIG
+    return SUPER
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
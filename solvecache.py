@@ -0,0 +1,207 @@
+# Boggle solve cache
+"""Caches solved boards under a canonical form shared by every rotation
+and mirror image of a board, so a board seen in any orientation is only
+solved once."""
+
+import sys
+from collections import OrderedDict
+from functools import lru_cache
+from bogglesolver import SolverEngine, SolvedWord
+from scoring import CLASSIC
+
+
+@lru_cache(maxsize=None)
+def symmetries(rows, cols):
+    """Returns the symmetries of a rows x cols grid as a tuple of cell
+    permutations: for permutation t, the transformed board has tiles[t[i]]
+    on cell i (row major).  A square grid has 8 (4 rotations, each
+    optionally mirrored); other grids have 4.  The identity comes first.
+    >>> len(symmetries(4, 4)), len(symmetries(4, 5))
+    (8, 4)
+    >>> symmetries(2, 2)[1]     # rotate a quarter turn clockwise
+    (2, 0, 3, 1)
+    """
+    def cell(r, c):
+        return r * cols + c
+
+    transforms = [
+        lambda r, c: cell(r, c),                        # identity
+        lambda r, c: cell(rows - 1 - c, r),             # rotate 90
+        lambda r, c: cell(rows - 1 - r, cols - 1 - c),  # rotate 180
+        lambda r, c: cell(c, cols - 1 - r),             # rotate 270
+        lambda r, c: cell(r, cols - 1 - c),             # mirror left/right
+        lambda r, c: cell(rows - 1 - r, c),             # mirror top/bottom
+        lambda r, c: cell(c, r),                        # transpose
+        lambda r, c: cell(rows - 1 - c, cols - 1 - r),  # anti-transpose
+    ]
+    if rows != cols:
+        # quarter turns and diagonal mirrors change the grid's shape
+        transforms = [transforms[i] for i in (0, 2, 4, 5)]
+    return tuple(tuple(t(r, c) for r in range(rows) for c in range(cols))
+                 for t in transforms)
+
+
+def canonical(tiles, rows, cols):
+    """Given a row major list of tile strings, returns (key, perm): key is
+    the tuple of tiles of the smallest symmetric image of the board and
+    perm the permutation (see symmetries) that produces it
+    >>> canonical(["A", "B", "C", "D"], 2, 2)[0] == canonical(["C", "A", "D", "B"], 2, 2)[0]
+    True
+    """
+    best = None
+    bestPerm = None
+    for perm in symmetries(rows, cols):
+        image = tuple([tiles[i] for i in perm])
+        if best is None or image < best:
+            best = image
+            bestPerm = perm
+    return best, bestPerm
+
+
+def entrySize(key, found):
+    """Returns the approximate memory in bytes used by a cache entry: the
+    key tuple, the word dict and its words and paths (tile strings and
+    cell numbers are shared, so they are not counted)"""
+    size = sys.getsizeof(key) + sys.getsizeof(found)
+    for word, path in found.items():
+        size += sys.getsizeof(word) + sys.getsizeof(path)
+    return size
+
+
+class SolveCache:
+    """A least recently used cache of solved boards in front of a
+    SolverEngine, with attributes:
+       *  _engine is the SolverEngine used on a miss
+       *  _entries is an OrderedDict mapping canonical board keys to the
+          words found on the canonical board, least recently used first
+       *  _sizes maps each key to its entry's size in bytes
+       *  _bytes (int) is the total size of the entries
+       *  _maxBytes (int) is the size the cache evicts down to
+       *  hits, misses (int) count lookups served from the cache or solved
+    A board found in the cache in another orientation has its word paths
+    remapped onto the board asked for.
+    >>> from bogglelexicon import BoggleLexicon
+    >>> lex = BoggleLexicon.fromWords(["art", "tar", "rat", "party"])
+    >>> cache = SolveCache(SolverEngine(2, 2, lex))
+    >>> sorted(cache.findWords(["P", "A", "R", "T"]).items())
+    [('art', (1, 2, 3)), ('rat', (2, 1, 3)), ('tar', (3, 1, 2))]
+    >>> sorted(cache.findWords(["R", "P", "T", "A"]).items())   # the same board turned
+    [('art', (3, 0, 2)), ('rat', (0, 3, 2)), ('tar', (2, 3, 0))]
+    >>> cache.hits, cache.misses, len(cache)
+    (1, 1, 1)
+    """
+
+    __slots__ = ['_engine', '_entries', '_sizes', '_bytes', '_maxBytes',
+                 'hits', 'misses']
+
+    def __init__(self, engine, maxBytes=64 * 1024 * 1024):
+        self._engine = engine
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._bytes = 0
+        self._maxBytes = maxBytes
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def engine(self):
+        return self._engine
+
+    @property
+    def bytes(self):
+        """Returns the approximate memory in bytes held by the entries"""
+        return self._bytes
+
+    @property
+    def maxBytes(self):
+        return self._maxBytes
+
+    @property
+    def hitRate(self):
+        """Returns the fraction of lookups served from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def findWords(self, tiles):
+        """Given a row major list of tile strings, returns a dict mapping
+        each word on the board to the tuple of cells of one path spelling
+        it, like SolverEngine.findWords"""
+        engine = self._engine
+        key, perm = canonical(tiles, engine.rows, engine.cols)
+        entries = self._entries
+        found = entries.get(key)
+        if found is None:
+            self.misses += 1
+            found = engine.findWords(key)
+            self._store(key, found)
+        else:
+            self.hits += 1
+            entries.move_to_end(key)
+        # cell i of the canonical board is cell perm[i] of this board
+        if perm == symmetries(engine.rows, engine.cols)[0]:
+            return dict(found)
+        remap = perm.__getitem__
+        return {word: tuple(map(remap, path)) for word, path in found.items()}
+
+    def solve(self, tiles, rules=CLASSIC):
+        """Given a row major list of tile strings, returns the list of
+        SolvedWords on the board in alphabetical order, scored with the
+        ScoringRules rules, like SolverEngine.solve"""
+        found = self.findWords(tiles)
+        cols = self._engine.cols
+        return [SolvedWord(word, [(cell % cols, cell // cols) for cell in found[word]],
+                           rules.scoreWord(word))
+                for word in sorted(found)]
+
+    def _store(self, key, found):
+        """Adds an entry and evicts least recently used entries until the
+        cache fits in maxBytes (an entry bigger than that is not kept)"""
+        size = entrySize(key, found)
+        if size > self._maxBytes:
+            return
+        self._entries[key] = found
+        self._sizes[key] = size
+        self._bytes += size
+        while self._bytes > self._maxBytes:
+            oldKey, old = self._entries.popitem(last=False)
+            self._bytes -= self._sizes.pop(oldKey)
+
+    def clear(self):
+        """Removes every entry and resets the counters"""
+        self._entries.clear()
+        self._sizes.clear()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, tiles):
+        engine = self._engine
+        return canonical(tiles, engine.rows, engine.cols)[0] in self._entries
+
+    def __repr__(self):
+        return "SolveCache({} boards, {} bytes, {} hits, {} misses)".format(
+            len(self._entries), self._bytes, self.hits, self.misses)
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
+
+    from time import perf_counter
+    from lexiconcache import loadLexicon
+    from bogglegrid import BoggleGrid
+
+    cache = SolveCache(SolverEngine(4, 4, loadLexicon()))
+    grid = BoggleGrid()
+    grid.shakeCubes()
+    turns = [[grid.tiles[i] for i in perm] for perm in symmetries(4, 4)]
+    start = perf_counter()
+    for i in range(1000):
+        for tiles in turns:
+            cache.findWords(tiles)
+    elapsed = perf_counter() - start
+    print(cache)
+    print("{:.1f} us per lookup".format(elapsed / (1000 * len(turns)) * 1e6))
@@ -0,0 +1,73 @@
+# Vectorized board shaker
+"""Shakes many boards at once with NumPy.  The cube set is encoded as an
+(n, 6) array of tile codes (see bogglegrid.TILES) and each call returns a
+(K, n) uint8 array holding K boards in row major order.
+
+Every board is a uniformly random arrangement of the cubes with a
+uniformly random face rolled on each, the same distribution as
+BoggleGrid.shakeCubes."""
+
+import numpy as np
+from bogglegrid import CUBES, TILE_CODES, decodeTiles
+from myrandom import BoggleRandom
+
+
+def cubeArray(cubes=CUBES):
+    """Returns the cube set cubes as an (n, faces) uint8 array of tile codes
+    >>> cubeArray(CUBES).shape
+    (16, 6)
+    >>> cubeArray(CUBES)[2].tolist()
+    [9, 12, 14, 26, 0, 1]
+    """
+    faces = len(cubes[0])
+    if any(len(cube) != faces for cube in cubes):
+        raise ValueError("every cube must have the same number of faces")
+    return np.array([[TILE_CODES[face] for face in cube] for cube in cubes],
+                    dtype=np.uint8)
+
+
+def shakeBoards(count, cubes=CUBES, rng=None):
+    """Returns a (count, n) uint8 array of tile codes for count boards shaken
+    from cubes.  rng may be a BoggleRandom, a numpy Generator or anything
+    accepted by numpy.random.default_rng (such as an int seed).
+    >>> boards = shakeBoards(1000, rng=7)
+    >>> boards.shape, boards.dtype.name
+    ((1000, 16), 'uint8')
+    >>> bool((shakeBoards(1000, rng=7) == boards).all())
+    True
+    >>> bool((shakeBoards(5, rng=BoggleRandom(3)) == shakeBoards(5, rng=BoggleRandom(3))).all())
+    True
+    """
+    table = cubeArray(cubes)
+    cubeCount, faceCount = table.shape
+    if isinstance(rng, BoggleRandom):
+        rng = rng.getrandbits(64)   # seed a numpy stream from the BoggleRandom
+    rng = np.random.default_rng(rng)
+
+    # one uniformly random permutation of the cubes per board (shuffling
+    # each row, so unlike sorting random keys there are no ties to bias it)
+    index = rng.permuted(np.broadcast_to(np.arange(cubeCount, dtype=np.uint16),
+                                         (count, cubeCount)), axis=1)
+    faces = rng.integers(0, faceCount, size=(count, cubeCount), dtype=np.uint16)
+
+    # pick the rolled face of each placed cube from the flattened table
+    index *= faceCount
+    index += faces
+    return table.ravel()[index]
+
+
+def boardTiles(codes):
+    """Returns the list of tile strings for one row of shakeBoards output"""
+    return decodeTiles(codes.tolist())
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
+
+    import time
+    start = time.perf_counter()
+    boards = shakeBoards(1000000)
+    elapsed = time.perf_counter() - start
+    print("{} boards in {:.3f} s".format(len(boards), elapsed))
+    print(boardTiles(boards[0]))
@@ -0,0 +1,258 @@
+# Word centric Boggle solver
+"""Solves boards by checking each word of a list against the board
+instead of searching the board's paths, with NumPy filters that rule out
+most words before any path is traced.
+
+Each word is stored as a 26 bit letter set and a row of a (words x 26)
+letter count matrix.  A board supplies the letters of its tiles ("Qu"
+supplies a Q and a U), so a word whose letter set or counts the board
+cannot cover is dropped with a few vectorized comparisons, and only the
+survivors are traced on the grid.  This wins when the word list is small
+(say a tournament's list of words to look for); searching the board wins
+for the full lexicon.  AutoSolver measures both and uses the faster."""
+
+from time import perf_counter
+import numpy as np
+from bogglelexicon import BoggleLexicon
+from bogglesolver import MIN_LENGTH, SolverEngine, neighborTable
+
+
+def letterMask(text):
+    """Returns the 26 bit set of the lower case letters in text
+    >>> bin(letterMask("cab"))
+    '0b111'
+    """
+    mask = 0
+    for ch in text:
+        mask |= 1 << (ord(ch) - 97)
+    return mask
+
+
+def letterCounts(texts):
+    """Returns a (26,) int array counting the letters of the lower case
+    strings in texts
+    >>> letterCounts(["qu", "u"])[[16, 20]].tolist()
+    [1, 2]
+    """
+    letters = np.frombuffer(''.join(texts).encode('ascii'), dtype=np.uint8)
+    letters = letters[(letters >= 97) & (letters <= 122)] - 97
+    return np.bincount(letters, minlength=26)
+
+
+class WordSolver:
+    """Finds which words of a fixed list are on rows x cols boards, with
+    attributes:
+       *  _rows, _cols (int) are the board size
+       *  _words is the sorted list of lower case words (of at least
+          MIN_LENGTH letters)
+       *  _masks is a uint32 array of each word's letter set
+       *  _counts is a (words x 26) uint8 array of each word's letter counts
+       *  boardsSolved (int) and solveTime (float) total the boards solved
+          and the seconds spent, as for SolverEngine
+    >>> solver = WordSolver(2, 2, ["art", "tar", "rat", "party", "trap", "quit"])
+    >>> solver.findWords(["P", "A", "R", "T"])
+    {'art': (1, 2, 3), 'rat': (2, 1, 3), 'tar': (3, 1, 2), 'trap': (3, 2, 1, 0)}
+    >>> solver.findWords(["Qu", "I", "", "T"])
+    {'quit': (0, 1, 3)}
+    """
+
+    __slots__ = ['_rows', '_cols', '_words', '_masks', '_counts',
+                 'boardsSolved', 'solveTime']
+
+    def __init__(self, rows, cols, words):
+        self._rows = rows
+        self._cols = cols
+        words = sorted(set(word.strip().lower() for word in words))
+        self._words = [word for word in words
+                       if len(word) >= MIN_LENGTH and word.isascii() and word.isalpha()]
+        self._masks = np.array([letterMask(word) for word in self._words], dtype=np.uint32)
+
+        # count every letter of every word in one scatter add
+        lengths = [len(word) for word in self._words]
+        rowsOf = np.repeat(np.arange(len(self._words)), lengths)
+        letters = np.frombuffer(''.join(self._words).encode('ascii'), dtype=np.uint8) - 97
+        self._counts = np.zeros((len(self._words), 26), dtype=np.uint8)
+        np.add.at(self._counts, (rowsOf, letters), 1)
+        self.boardsSolved = 0
+        self.solveTime = 0.0
+
+    @classmethod
+    def fromLexicon(cls, rows, cols, lex):
+        """Returns a WordSolver for every word in the BoggleLexicon lex"""
+        return cls(rows, cols, lex.words())
+
+    @property
+    def rows(self):
+        return self._rows
+
+    @property
+    def cols(self):
+        return self._cols
+
+    @property
+    def words(self):
+        return list(self._words)
+
+    @property
+    def throughput(self):
+        """Returns the boards solved per second so far"""
+        if not self.solveTime:
+            return 0.0
+        return self.boardsSolved / self.solveTime
+
+    def candidates(self, tiles):
+        """Returns the array of indices of the words whose letters the
+        board (a row major list of tile strings) can supply"""
+        texts = [tile.lower() for tile in tiles]
+        board = letterMask(''.join(text for text in texts if text.isalpha()))
+        survivors = np.flatnonzero((self._masks & np.uint32(~board & 0x3FFFFFF)) == 0)
+        if len(survivors):
+            counts = letterCounts(texts).astype(np.uint8)
+            survivors = survivors[(self._counts[survivors] <= counts).all(axis=1)]
+        return survivors
+
+    def findWords(self, tiles):
+        """Given a row major list of tile strings, returns a dict mapping
+        each listed word on the board to the tuple of cells of one path
+        spelling it, like SolverEngine.findWords"""
+        start = perf_counter()
+        texts = [tile.lower() for tile in tiles]
+        neighbors = neighborTable(self._rows, self._cols)
+        found = {}
+        for index in self.candidates(tiles):
+            word = self._words[index]
+            path = tracePath(word, texts, neighbors)
+            if path is not None:
+                found[word] = path
+        self.boardsSolved += 1
+        self.solveTime += perf_counter() - start
+        return found
+
+
+def tracePath(word, texts, neighbors):
+    """Returns the tuple of cells of a path spelling word on the board with
+    lower case tiles texts and the given neighborTable, or None
+    >>> tracePath("tap", ["p", "a", "r", "t"], neighborTable(2, 2))
+    (3, 1, 0)
+    """
+    end = len(word)
+
+    def extend(cell, pos, used, path):
+        text = texts[cell]
+        if not text or not word.startswith(text, pos):
+            return None
+        pos += len(text)
+        path = path + (cell,)
+        if pos == end:
+            return path
+        for nxt, bit in neighbors[cell]:
+            if not used & bit:
+                found = extend(nxt, pos, used | bit, path)
+                if found is not None:
+                    return found
+        return None
+
+    for cell in range(len(texts)):
+        found = extend(cell, 0, 1 << cell, ())
+        if found is not None:
+            return found
+    return None
+
+
+class AutoSolver:
+    """Finds the words of a list (or of a whole lexicon) on rows x cols
+    boards with whichever of a board search (SolverEngine) and a word
+    search (WordSolver) is faster for the workload; both give the same
+    words.  The first boards alternate between the two, and once each has
+    solved trials boards the one with the lower median time is kept.
+    Attributes:
+       *  _engine is the SolverEngine, over a lexicon of the listed words
+       *  _wordSolver is the WordSolver over the same words
+       *  _trials (int) is how many boards each search is timed on
+       *  _times maps "board" and "word" to the trial times in seconds
+       *  _mode is the chosen search, or None while still timing
+    >>> solver = AutoSolver(2, 2, words=["art", "tar", "rat", "party"])
+    >>> for i in range(10):
+    ...     words = solver.findWords(["P", "A", "R", "T"])
+    >>> sorted(words), solver.mode in ("board", "word")
+    (['art', 'rat', 'tar'], True)
+    >>> solver = AutoSolver(2, 2, words=(word for word in ["art", "tar"]))
+    >>> len(solver.wordSolver.words), sorted(solver.engine.findWords(["P", "A", "R", "T"]))
+    (2, ['art', 'tar'])
+    """
+
+    __slots__ = ['_engine', '_wordSolver', '_trials', '_times', '_mode']
+
+    def __init__(self, rows, cols, words=None, lex=None, trials=5):
+        if words is None:
+            words = lex.words()
+        words = list(words)     # both searches read it, so a generator must be kept
+        if lex is None:
+            lex = BoggleLexicon.fromWords(words)
+        self._engine = SolverEngine(rows, cols, lex)
+        self._wordSolver = WordSolver(rows, cols, words)
+        self._trials = trials
+        self._times = {"board": [], "word": []}
+        self._mode = None
+
+    @property
+    def mode(self):
+        """Returns "board" or "word", the search the next board will use"""
+        if self._mode is not None:
+            return self._mode
+        times = self._times
+        return "board" if len(times["board"]) <= len(times["word"]) else "word"
+
+    @property
+    def engine(self):
+        return self._engine
+
+    @property
+    def wordSolver(self):
+        return self._wordSolver
+
+    def findWords(self, tiles):
+        """Given a row major list of tile strings, returns a dict mapping
+        each word on the board to the tuple of cells of one path spelling
+        it, like SolverEngine.findWords"""
+        mode = self.mode
+        solver = self._engine if mode == "board" else self._wordSolver
+        if self._mode is not None:
+            return solver.findWords(tiles)
+
+        start = perf_counter()
+        found = solver.findWords(tiles)
+        times = self._times
+        times[mode].append(perf_counter() - start)
+        if len(times["word"]) >= self._trials:
+            board, word = (sorted(times[name])[self._trials // 2] for name in ("board", "word"))
+            self._mode = "board" if board <= word else "word"
+        return found
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
+
+    from bogglegrid import BoggleGrid
+    from lexiconcache import loadLexicon
+    from myrandom import BoggleRandom
+
+    lex = loadLexicon()
+    rng = BoggleRandom(1)
+    boards = []
+    for i in range(200):
+        grid = BoggleGrid()
+        grid.shakeCubes(rng=rng)
+        boards.append(grid.tiles)
+    allWords = list(lex.words())
+    for count in (10, 50, 500, 5000, len(allWords)):
+        words = allWords[::len(allWords) // count][:count]
+        solver = AutoSolver(4, 4, words=words)
+        solver.findWords(boards[0])    # warm up before timing starts
+        solver.engine.findWords(boards[0])
+        for tiles in boards:
+            solver.findWords(tiles)
+        print("{:>6} words: board {:6.0f} us, word {:6.0f} us -> {}".format(
+            count, 1e6 / solver.engine.throughput, 1e6 / solver.wordSolver.throughput,
+            solver.mode))